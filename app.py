@@ -1,70 +1,1023 @@
-from flask import Flask, render_template, request, redirect, session, url_for, flash
+from flask import Flask, render_template, request, redirect, session, url_for, flash, g, has_app_context, has_request_context, jsonify, Response, stream_with_context
+import click
+import cProfile
 import sqlite3
-from datetime import datetime
+from bisect import bisect_left, bisect_right
+from array import array
+from collections import OrderedDict, defaultdict, namedtuple
+import csv
+import functools
+import heapq
+import io
+import itertools
+import json
+import math
+import multiprocessing
+import operator
+import os
+import queue
+import random
+import re
+import secrets
+import statistics
+import threading
 import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
 
 app = Flask(__name__)
 app.secret_key = 'your_secret_key'  # Required for flash messages
+app.config['DATABASE'] = os.environ.get('SCHEDULE_DATABASE', 'university_schedule.db')
+app.config['DB_POOL_SIZE'] = int(os.environ.get('SCHEDULE_DB_POOL_SIZE', 8))
+app.config['SOLVER_WORKERS'] = int(os.environ.get('SCHEDULE_SOLVER_WORKERS', 3))
+app.config['SOLVER_DEADLINE'] = float(os.environ.get('SCHEDULE_SOLVER_DEADLINE', 3.0))  # Seconds per solver
+app.config['SOLVE_JOB_WORKERS'] = int(os.environ.get('SCHEDULE_SOLVE_JOB_WORKERS', 1))
+app.config['SOLVE_JOB_DEADLINE'] = float(os.environ.get('SCHEDULE_SOLVE_JOB_DEADLINE', 120.0))  # Seconds per solver
+app.config['SOLVE_JOB_QUEUE_TIMEOUT'] = float(os.environ.get('SCHEDULE_SOLVE_JOB_QUEUE_TIMEOUT', 3600.0))  # Seconds
+app.config['SOLVER_CACHE_SIZE'] = int(os.environ.get('SCHEDULE_SOLVER_CACHE_SIZE', 64))
+app.config['SOLVER_CACHE_TTL'] = float(os.environ.get('SCHEDULE_SOLVER_CACHE_TTL', 600.0))  # Seconds
+app.config['PAGE_SIZE'] = int(os.environ.get('SCHEDULE_PAGE_SIZE', 50))  # Courses per listing page
+app.config['PROFILING'] = os.environ.get('SCHEDULE_PROFILING') == '1'  # Allow per-request cProfile via X-Profile
+app.config['PROFILE_DIR'] = os.environ.get('SCHEDULE_PROFILE_DIR', 'profiles')
+
+# Map weekdays to numeric values for sorting and comparison
+DAY_MAP = {
+    'Monday': 1,
+    'Tuesday': 2,
+    'Wednesday': 3,
+    'Thursday': 4,
+    'Friday': 5,
+    'Saturday': 6,
+    'Sunday': 7
+}
+
+DAY_NAMES = list(DAY_MAP)
+
+# Rooms used when the database has no room inventory yet
+DEFAULT_ROOMS = (1, 2, 3, 4, 5)
+DEFAULT_ROOM_CAPACITY = 40
+MAX_CANDIDATE_ROOMS = 12          # Fitting rooms the search solvers offer each course
+
+# Backtracking search settings
+SLOT_MINUTES = 5                  # Width of one bit in a day's slot mask
+BACKTRACK_SHIFT_MINUTES = 60      # Courses are moved later in whole hours
+BACKTRACK_DAY_END = 18 * 60       # Assuming courses must end by 6:00 PM
+BACKTRACK_NODE_BUDGET = 200000    # Search nodes before returning the best assignment found (no deadline given)
+BACKTRACK_TIME_BUDGET = 2.0       # Seconds before returning the best assignment found (no deadline given)
+PROGRESS_INTERVAL_NODES = 2048    # Search nodes between progress reports
+
+# Extra seconds a solver process gets past its deadline to hand back its partial result
+SOLVER_DEADLINE_GRACE = 1.0
+UNPROCESSED_REASON = "Not processed before the deadline"
+
+# Comparison mode: every solver is timed repeatedly on growing subsets of the selection
+COMPARE_SIZE_FRACTIONS = (0.125, 0.25, 0.5, 1.0)
+COMPARE_REPEATS = 5               # Timed runs per size
+COMPARE_WARMUP_RUNS = 1           # Untimed runs per size before timing
+COMPARE_RUN_DEADLINE = 0.5        # Seconds per run
+
+# SQLite connection settings
+DB_BUSY_TIMEOUT = 10.0            # Seconds a writer waits for a lock before "database is locked"
+DB_STATEMENT_CACHE_SIZE = 256     # Prepared statements kept per connection
+DB_MMAP_SIZE = 256 * 1024 * 1024  # Bytes of the database file read through mmap
+
+# Instrumentation: counters and histograms for this worker process, served at /metrics
+REQUEST_SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_SECONDS_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+SOLVER_COUNT_BUCKETS = (10, 100, 1000, 10000, 100000, 1000000)
+
+
+class MetricsRegistry:
+    """Counters and histograms rendered in the Prometheus text exposition format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._descriptions = {}  # name -> (kind, help, buckets)
+        self._counters = {}      # (name, labels) -> value
+        self._histograms = {}    # (name, labels) -> [count per bucket..., sum, count]
+
+    def describe(self, name, kind, help_text, buckets=()):
+        self._descriptions[name] = (kind, help_text, tuple(buckets))
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        buckets = self._descriptions[name][2]
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            series = self._histograms.get(key)
+            if series is None:
+                series = self._histograms[key] = [0] * (len(buckets) + 2)
+            series[bisect_left(buckets, value)] += 1  # Non-cumulative here, summed up when rendered
+            series[-2] += value
+            series[-1] += 1
+
+    @staticmethod
+    def _labels(labels, extra=()):
+        pairs = [*labels, *extra]
+        if not pairs:
+            return ''
+        return '{' + ','.join('{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+                              for name, value in pairs) + '}'
+
+    def render(self):
+        lines = []
+        with self._lock:
+            for name, (kind, help_text, buckets) in self._descriptions.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                if kind == 'counter':
+                    for (series_name, labels), value in sorted(self._counters.items()):
+                        if series_name == name:
+                            lines.append(f"{name}{self._labels(labels)} {value}")
+                    continue
+                for (series_name, labels), series in sorted(self._histograms.items()):
+                    if series_name != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip((*buckets, '+Inf'), series):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{self._labels(labels, [('le', bound)])} {cumulative}")
+                    lines.append(f"{name}_sum{self._labels(labels)} {series[-2]}")
+                    lines.append(f"{name}_count{self._labels(labels)} {series[-1]}")
+        return '\n'.join(lines) + '\n'
+
+
+metrics = MetricsRegistry()
+metrics.describe('schedule_requests_total', 'counter', "Requests handled, by endpoint, method and status.")
+metrics.describe('schedule_request_seconds', 'histogram', "Request latency in seconds.", REQUEST_SECONDS_BUCKETS)
+metrics.describe('schedule_request_db_queries', 'histogram', "SQL statements executed per request.", QUERY_COUNT_BUCKETS)
+metrics.describe('schedule_request_db_seconds', 'histogram', "Time spent executing SQL per request.", REQUEST_SECONDS_BUCKETS)
+metrics.describe('schedule_db_query_seconds', 'histogram', "Execution time of single SQL statements.", QUERY_SECONDS_BUCKETS)
+metrics.describe('schedule_solver_runs_total', 'counter', "Solver runs, by solver and outcome.")
+metrics.describe('schedule_solver_seconds', 'histogram', "Solver run time in seconds.", REQUEST_SECONDS_BUCKETS)
+metrics.describe('schedule_solver_operations', 'histogram', "Solver work per run, by counter (nodes, prunes, placement attempts).",
+                 SOLVER_COUNT_BUCKETS)
+
+
+def record_query(seconds):
+    """Count one SQL statement globally and against the current request."""
+    metrics.observe('schedule_db_query_seconds', seconds)
+    if has_request_context():
+        g.db_queries = g.get('db_queries', 0) + 1
+        g.db_seconds = g.get('db_seconds', 0.0) + seconds
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that times each statement (execution up to the first row, not the fetches)."""
+
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            record_query(time.perf_counter() - start)
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            record_query(time.perf_counter() - start)
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors, including the ones behind conn.execute(), are instrumented."""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def record_solver_metrics(name, result, seconds):
+    outcome = 'error' if result.get('error_message') else 'timed_out' if result.get('timed_out') else 'complete'
+    metrics.inc('schedule_solver_runs_total', solver=name, outcome=outcome)
+    metrics.observe('schedule_solver_seconds', seconds, solver=name)
+    for counter, value in result.get('stats', {}).items():
+        metrics.observe('schedule_solver_operations', value, solver=name, counter=counter)
+
+
+# Idle connections shared by the requests handled in this worker process
+_connection_pool = queue.LifoQueue()
+
+
+def open_db_connection(db_path=None):
+    """Open a tuned connection: WAL journal, NORMAL sync and memory-mapped reads."""
+    conn = sqlite3.connect(db_path or app.config['DATABASE'], timeout=DB_BUSY_TIMEOUT,
+                           cached_statements=DB_STATEMENT_CACHE_SIZE, check_same_thread=False,
+                           factory=InstrumentedConnection)
+    conn.row_factory = sqlite3.Row  # Allows rows to behave like dictionaries
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA mmap_size={DB_MMAP_SIZE}")
+    return conn
+
 
 # SQLite Database connection function with context manager
 def get_db_connection():
-    """Establishes and returns a connection to the SQLite database."""
+    """Return the current request's connection, checking one out of the pool on first use.
+
+    The connection is returned to the pool when the app context ends, so callers should not
+    close it; `with get_db_connection() as conn:` still commits or rolls back the transaction.
+    """
     try:
-        conn = sqlite3.connect('university_schedule.db')
-        conn.row_factory = sqlite3.Row  # Allows rows to behave like dictionaries
-        return conn
+        if not has_app_context():
+            return open_db_connection()
+        if 'db' not in g:
+            g.db = _checkout_db_connection()
+        return g.db
     except sqlite3.Error as e:
         print(f"Database connection error: {e}")
-        flash(f"Database error: {e}", "danger")
+        if has_request_context():
+            flash(f"Database error: {e}", "danger")
         return None
 
 
+def _checkout_db_connection():
+    db_path = app.config['DATABASE']
+    while True:
+        try:
+            pooled_path, conn = _connection_pool.get_nowait()
+        except queue.Empty:
+            return open_db_connection(db_path)
+        if pooled_path == db_path:
+            return conn
+        conn.close()  # The database path was reconfigured since this connection was pooled
+
+
+@app.teardown_appcontext
+def release_db_connection(exception):
+    """Hand the request's connection back to the pool, discarding any unfinished transaction."""
+    conn = g.pop('db', None)
+    if conn is None:
+        return
+    try:
+        if conn.in_transaction:
+            conn.rollback()
+    except sqlite3.Error:
+        conn.close()
+        return
+    if _connection_pool.qsize() < app.config['DB_POOL_SIZE']:
+        _connection_pool.put((app.config['DATABASE'], conn))
+    else:
+        conn.close()
+
+
+@app.before_request
+def start_request_metrics():
+    g.request_started = time.perf_counter()
+    g.db_queries = 0
+    g.db_seconds = 0.0
+    # Opt-in profiling of a single request: send "X-Profile: 1" with PROFILING enabled
+    if app.config['PROFILING'] and request.headers.get('X-Profile'):
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+
+@app.after_request
+def record_request_metrics(response):
+    """Record the request's latency and SQL work; save its profile when one was requested."""
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        os.makedirs(app.config['PROFILE_DIR'], exist_ok=True)
+        path = os.path.join(app.config['PROFILE_DIR'], f"{request.endpoint or 'unmatched'}-{uuid.uuid4().hex[:8]}.prof")
+        profiler.dump_stats(path)
+        response.headers['X-Profile-File'] = path
+
+    endpoint = request.endpoint or 'unmatched'
+    metrics.inc('schedule_requests_total', endpoint=endpoint, method=request.method, status=response.status_code)
+    metrics.observe('schedule_request_seconds', time.perf_counter() - g.get('request_started', time.perf_counter()),
+                    endpoint=endpoint)
+    metrics.observe('schedule_request_db_queries', g.get('db_queries', 0), endpoint=endpoint)
+    metrics.observe('schedule_request_db_seconds', g.get('db_seconds', 0.0), endpoint=endpoint)
+    return response
+
+
+# Route exposing this worker's metrics in the Prometheus text format
+@app.route('/metrics', methods=['GET'])
+def metrics_view():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+
+# Parse a comma-separated feature list such as "projector, lab"
+def parse_features(features):
+    """Return the set of lower-cased feature names in a comma-separated string."""
+    return frozenset(feature.strip().lower() for feature in (features or '').split(',') if feature.strip())
+
+
+# Room inventory shared by all solvers
+class RoomCatalogue:
+    """Rooms sorted by capacity, so the rooms that fit a course come from one bisect."""
+
+    def __init__(self, rooms):
+        self.rooms = sorted(rooms, key=lambda room: (room[2], room[0]))  # (id, name, capacity, features)
+        self.capacities = [room[2] for room in self.rooms]
+        self.names = {room[0]: room[1] for room in self.rooms}
+        self._candidates = {}
+
+    def candidate_rooms(self, enrollment=0, required_features=frozenset()):
+        """Every room, smallest first, that seats `enrollment` and offers the required features."""
+        key = (enrollment, required_features)
+        if key not in self._candidates:
+            fitting = self.rooms[bisect_left(self.capacities, enrollment):]
+            self._candidates[key] = tuple(room_id for room_id, _, _, features in fitting if required_features <= features)
+        return self._candidates[key]
+
+
+def candidate_window(fitting, course_id, limit=MAX_CANDIDATE_ROOMS):
+    """The `limit` fitting rooms the search solvers offer a course, wrapping around the list.
+
+    The window starts at a position picked by the course id, so courses that fit the same
+    rooms are spread over all of them instead of all competing for the smallest few.
+    """
+    if len(fitting) <= limit:
+        return fitting
+    offset = course_id * limit % len(fitting)
+    return fitting[offset:offset + limit] + fitting[:max(0, offset + limit - len(fitting))]
+
+
+def build_room_catalogue(rows):
+    """Catalogue from rooms rows; an empty or missing rooms table falls back to the default rooms."""
+    if not rows:
+        rows = [(room, f"Room {room}", DEFAULT_ROOM_CAPACITY, '') for room in DEFAULT_ROOMS]
+    return RoomCatalogue((room_id, name, capacity, parse_features(features)) for room_id, name, capacity, features in rows)
+
+
+# (rooms_version, RoomCatalogue) of this process, loaded on first use
+_room_catalogue = None
+
+
+def get_room_catalogue(conn=None):
+    """The room inventory, loaded on first use and again whenever the rooms table changes.
+
+    Triggers on rooms bump rooms_version in schedule_meta, so the check on later calls is
+    one primary-key lookup. Without a connection, one is opened for the check.
+    """
+    global _room_catalogue
+    own_conn = conn is None
+    try:
+        if own_conn:
+            conn = open_db_connection()
+        try:
+            row = conn.execute("SELECT value FROM schedule_meta WHERE key = 'rooms_version'").fetchone()
+            version = row[0] if row else None
+            if _room_catalogue is None or _room_catalogue[0] != version:
+                rows = conn.execute("SELECT id, name, capacity, features FROM rooms").fetchall()
+                _room_catalogue = (version, build_room_catalogue(rows))
+        finally:
+            if own_conn:
+                conn.close()
+    except sqlite3.Error as e:
+        # Keep a catalogue that was already loaded; older databases without a rooms table get the defaults
+        if _room_catalogue is None:
+            app.logger.warning(f"Room catalogue unavailable, using default rooms: {e}")
+            _room_catalogue = (None, build_room_catalogue([]))
+    return _room_catalogue[1]
+
+
+# Shared time and day parsing: the database stores minutes since midnight and a day number
+def parse_time(value):
+    """Convert an 'HH:MM' (or 'HH:MM:SS') string to minutes since midnight."""
+    parts = str(value).strip().split(':')
+    if len(parts) not in (2, 3) or not all(part.isdigit() for part in parts):
+        raise ValueError(f"Invalid time: {value!r}")
+    hours, minutes = int(parts[0]), int(parts[1])
+    if hours > 23 or minutes > 59:
+        raise ValueError(f"Invalid time: {value!r}")
+    return hours * 60 + minutes
+
+
+def format_time(minutes):
+    """Convert minutes since midnight back to an 'HH:MM' string."""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def parse_day(value):
+    """Convert a weekday name or abbreviation ('Monday', 'mon') to 1 (Monday) .. 7 (Sunday)."""
+    day = str(value).strip().lower()
+    if len(day) >= 3:
+        for name, number in DAY_MAP.items():
+            if name.lower().startswith(day):
+                return number
+    raise ValueError(f"Invalid day of week: {value!r}")
+
+
 # Validate course start and end times
 def validate_times(class_start_time, class_end_time):
     """Validates start time and end time of the course."""
     try:
-        start_time = datetime.strptime(class_start_time, '%H:%M')
-        end_time = datetime.strptime(class_end_time, '%H:%M')
+        start_time = parse_time(class_start_time)
+        end_time = parse_time(class_end_time)
         if start_time >= end_time:
             return "End time must be after start time."
         return None
     except ValueError:
         return "Invalid time format. Please use HH:MM format."
+
+
+# Validate the day of the week
+def validate_day(day_of_week):
+    """Validates the day of the week of the course."""
+    try:
+        parse_day(day_of_week)
+        return None
+    except ValueError:
+        return "Invalid day of week. Please use a weekday name such as Monday."
     
 
 # Helper function to check for conflicts in scheduling.
-def check_schedule_conflict(conn, teacher_name, day_of_week, start_time, end_time, room):
+def check_schedule_conflict(conn, teacher_name, day_number, start_minute, end_minute, room, exclude_id=None):
     """Check scheduling conflicts for teacher, room, slot overlaps, and days."""
     cursor = conn.cursor()
-    
-    # SQL query to check for conflicts based on combinations of criteria
+
+    # Two courses overlap when each one starts before the other ends. Each half of the UNION
+    # is a range seek on idx_course_room_slot / idx_course_teacher_slot instead of a table scan.
     cursor.execute("""
-        SELECT * FROM course_schedule WHERE
-        (
-            -- Case 1: Teacher conflict
-            (teacher_name = ? AND day_of_week = ? AND
-            ((class_start_time < ? AND class_end_time > ?) OR  -- New course starts before existing course ends
-             (class_start_time < ? AND class_end_time > ?)))  -- New course ends after existing course starts
-        )
-        OR
-        (
-            -- Case 2: Room conflict (same room, same day, overlapping time)
-            (room = ? AND day_of_week = ? AND
-            ((class_start_time < ? AND class_end_time > ?) OR  -- New course starts before existing course ends
-             (class_start_time < ? AND class_end_time > ?)))  -- New course ends after existing course starts
-        )
-    """, (teacher_name, day_of_week, start_time, start_time, end_time, end_time, 
-          room, day_of_week, start_time, start_time, end_time, end_time))
-    
+        SELECT * FROM course_schedule
+        WHERE day_number = ? AND room = ? AND start_minute < ? AND end_minute > ? AND id IS NOT ?
+        UNION
+        SELECT * FROM course_schedule
+        WHERE day_number = ? AND teacher_name = ? AND start_minute < ? AND end_minute > ? AND id IS NOT ?
+    """, (day_number, room, end_minute, start_minute, exclude_id,
+          day_number, teacher_name, end_minute, start_minute, exclude_id))
+
     conflicts = cursor.fetchall()
     return conflicts
    
 
+def record_course_conflicts(conn, course_id):
+    """Replace the stored conflicts of one course with its current room and teacher overlaps.
+
+    Only the course's own day/room and day/teacher ranges are probed, through the same slot
+    indexes as check_schedule_conflict, so the cost depends on that day's bookings rather than
+    on the size of the schedule. Pairs are stored once with the lower id first.
+    """
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM course_conflicts WHERE course_id = ? OR other_id = ?", (course_id, course_id))
+    for kind, column in (('room', 'room'), ('teacher', 'teacher_name')):
+        cursor.execute(f"""
+            INSERT OR IGNORE INTO course_conflicts (course_id, other_id, kind)
+            SELECT min(c.id, o.id), max(c.id, o.id), ? FROM course_schedule c
+            JOIN course_schedule o ON o.day_number = c.day_number AND o.{column} = c.{column}
+                AND o.start_minute < c.end_minute AND o.end_minute > c.start_minute AND o.id != c.id
+            WHERE c.id = ?
+        """, (kind, course_id))
+    cursor.execute("SELECT COUNT(*) FROM course_conflicts WHERE course_id = ? OR other_id = ?", (course_id, course_id))
+    return cursor.fetchone()[0]
+
+
+# Materialised busy-slot map: one SLOT_MINUTES bitmask per (day, room) and per (day, teacher),
+# stored as a little-endian BLOB (bit n is the slot starting n * SLOT_MINUTES after midnight)
+SLOT_MASK_BYTES = -(-24 * 60 // SLOT_MINUTES // 8)
+BUSY_SLOT_TABLES = (('room_busy_slots', 'room'), ('teacher_busy_slots', 'teacher_name'))
+
+
+def encode_slot_mask(mask):
+    return mask.to_bytes(SLOT_MASK_BYTES, 'little')
+
+
+def decode_slot_mask(blob):
+    return int.from_bytes(blob, 'little')
+
+
+def refresh_busy_slots(conn, bookings):
+    """Rebuild the busy-slot masks of the (day, room) and (day, teacher) keys of `bookings`.
+
+    `bookings` are (day_number, room, teacher_name) tuples for a course before and after a
+    change. Each key is recomputed from its own courses through the slot indexes, so overlaps
+    and deletes need no special handling; keys left without courses are dropped.
+    """
+    cursor = conn.cursor()
+    for (table, column), position in zip(BUSY_SLOT_TABLES, (1, 2)):
+        for day_number, value in {(booking[0], booking[position]) for booking in bookings}:
+            cursor.execute(f"SELECT start_minute, end_minute FROM course_schedule WHERE day_number = ? AND {column} = ?",
+                           (day_number, value))
+            mask = functools.reduce(operator.or_, (slot_mask(start, end) for start, end in cursor.fetchall()), 0)
+            if mask:
+                cursor.execute(f"INSERT OR REPLACE INTO {table} (day_number, {column}, busy) VALUES (?, ?, ?)",
+                               (day_number, value, encode_slot_mask(mask)))
+            else:
+                cursor.execute(f"DELETE FROM {table} WHERE day_number = ? AND {column} = ?", (day_number, value))
+
+
+def find_free_rooms(conn, day_number, start_minute, end_minute, enrollment=0, required_features=frozenset()):
+    """Catalogue rooms, smallest first, that seat `enrollment`, offer the features and are free.
+
+    One AND per room against its stored busy mask; a room without a row is free all day.
+    Partial slots count as busy, like in the solvers.
+    """
+    wanted = slot_mask(start_minute, end_minute)
+    cursor = conn.cursor()
+    cursor.execute("SELECT room, busy FROM room_busy_slots WHERE day_number = ?", (day_number,))
+    busy = {row['room']: decode_slot_mask(row['busy']) for row in cursor}
+    return [{'id': room_id, 'name': name, 'capacity': capacity, 'features': sorted(features)}
+            for room_id, name, capacity, features in get_room_catalogue(conn).rooms
+            if capacity >= enrollment and required_features <= features and not busy.get(room_id, 0) & wanted]
+
+
+def teacher_is_free(conn, teacher_name, day_number, start_minute, end_minute):
+    cursor = conn.cursor()
+    cursor.execute("SELECT busy FROM teacher_busy_slots WHERE day_number = ? AND teacher_name = ?", (day_number, teacher_name))
+    row = cursor.fetchone()
+    return not (row and decode_slot_mask(row['busy']) & slot_mask(start_minute, end_minute))
+
+
+def fetch_selection_conflicts(conn, token):
+    """Look up the stored room and teacher conflicts among a selection's courses, grouped by day name."""
+    selection = "SELECT course_id FROM course_selections WHERE token = ?"
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT c.day_of_week, c.course_title, c.teacher_name, o.course_title, o.teacher_name,
+               o.class_start_time, o.class_end_time, o.room, cc.kind
+        FROM course_conflicts cc
+        JOIN course_schedule c ON c.id = cc.course_id
+        JOIN course_schedule o ON o.id = cc.other_id
+        WHERE cc.course_id IN ({selection}) AND cc.other_id IN ({selection})
+        ORDER BY c.day_number, c.start_minute, c.id, o.id, cc.kind
+    """, (token, token))
+
+    conflicts = {}
+    for row in cursor:
+        conflicts.setdefault(row[0], []).append({
+            'course_name': row[1],
+            'teacher_name': row[2],
+            'conflicting_course_name': row[3],
+            'conflicting_teacher_name': row[4],
+            'conflicting_start_time': row[5],
+            'conflicting_end_time': row[6],
+            'conflicting_room': row[7],
+            'kind': row[8],
+        })
+    return conflicts
+
+
+def find_overlapping_pairs(bookings):
+    """Yield (course_id, other_id), lower id first, for every overlapping pair within a group.
+
+    `bookings` are (group, start_minute, end_minute, course_id) tuples. Each group is swept in
+    start order while a heap holds the bookings still in progress, keyed on their end; once the
+    finished ones are popped, the new booking overlaps exactly what is left. The cost is
+    O(k log k + conflicts) instead of comparing every pair.
+    """
+    groups = {}
+    for group, start_minute, end_minute, course_id in bookings:
+        groups.setdefault(group, []).append((start_minute, end_minute, course_id))
+
+    for group_bookings in groups.values():
+        group_bookings.sort()
+        in_progress = []
+        for start_minute, end_minute, course_id in group_bookings:
+            while in_progress and in_progress[0][0] <= start_minute:
+                heapq.heappop(in_progress)
+            for _, other_id in in_progress:
+                yield (min(course_id, other_id), max(course_id, other_id))
+            heapq.heappush(in_progress, (end_minute, course_id))
+
+
+def detect_conflicts(courses):
+    """Yield (course_id, other_id, kind) for the room and teacher double-bookings among courses."""
+    for kind, column in (('room', 'room'), ('teacher', 'teacher_name')):
+        bookings = (((course['day_number'], course[column]), course['start_minute'], course['end_minute'], course['id'])
+                    for course in courses)
+        for course_id, other_id in find_overlapping_pairs(bookings):
+            yield course_id, other_id, kind
+
+
+# Immutable course snapshot: loaded once per request and shared by every solver
+Course = namedtuple('Course', [
+    'id', 'teacher_name', 'course_title', 'day_of_week', 'class_start_time', 'class_end_time', 'room',
+    'enrollment', 'required_features', 'day_number', 'start_minute', 'end_minute'
+])
+
+
+def fetch_course_snapshot(conn, course_ids):
+    """Load the given courses as a tuple of Course records sorted by day and start time."""
+    cursor = conn.cursor()
+    # The ids travel as one JSON parameter, so selections of any size stay one statement
+    query = """
+        SELECT {} FROM course_schedule WHERE id IN (SELECT value FROM json_each(?))
+        ORDER BY day_number, start_minute, id
+    """.format(', '.join(Course._fields))
+    cursor.execute(query, (json.dumps([int(course_id) for course_id in course_ids]),))
+    return tuple(Course(*row) for row in cursor)
+
+
+# Course selections live in course_selections keyed by a short token kept in the session cookie,
+# so a selection can hold thousands of courses without growing the cookie
+SELECTION_TTL = 30 * 24 * 3600    # Seconds an untouched selection is kept
+
+
+def get_selection_token(create=False):
+    """The session's selection token, creating one on request; None if it has none yet."""
+    token = session.get('selection_token')
+    if token is None and create:
+        token = session['selection_token'] = secrets.token_urlsafe(12)
+    return token
+
+
+def load_selection(conn, among=None):
+    """Sorted ids of the courses selected in this session (an index range scan on the token).
+
+    With `among`, only those of the given course ids that are selected are returned.
+    """
+    token = get_selection_token()
+    if token is None:
+        return []
+    cursor = conn.cursor()
+    if among is None:
+        cursor.execute("SELECT course_id FROM course_selections WHERE token = ? ORDER BY course_id", (token,))
+    else:
+        cursor.execute("""
+            SELECT course_id FROM course_selections
+            WHERE token = ? AND course_id IN (SELECT value FROM json_each(?)) ORDER BY course_id
+        """, (token, json.dumps([int(course_id) for course_id in among])))
+    return [row[0] for row in cursor]
+
+
+def parse_course_ids(values):
+    """Course ids from form values; values that aren't whole numbers are skipped."""
+    return [int(value) for value in values if str(value).strip().isdigit()]
+
+
+def update_selection(conn, add_ids=(), remove_ids=()):
+    """Add and remove courses in this session's selection and drop selections left untouched too long.
+
+    Ids that aren't whole numbers or no longer name a course are ignored.
+    Returns the number of courses now selected.
+    """
+    token = get_selection_token(create=True)
+    now = time.time()
+    cursor = conn.cursor()
+    cursor.execute("""
+        DELETE FROM course_selections
+        WHERE token = ? AND course_id IN (SELECT value FROM json_each(?))
+    """, (token, json.dumps(parse_course_ids(remove_ids))))
+    cursor.execute("""
+        INSERT OR IGNORE INTO course_selections (token, course_id)
+        SELECT ?, value FROM json_each(?) JOIN course_schedule ON course_schedule.id = value
+    """, (token, json.dumps(parse_course_ids(add_ids))))
+    cursor.execute("INSERT OR REPLACE INTO selections (token, updated_at) VALUES (?, ?)", (token, now))
+
+    cursor.execute("""
+        DELETE FROM course_selections
+        WHERE token IN (SELECT token FROM selections WHERE updated_at < ?)
+    """, (now - SELECTION_TTL,))
+    cursor.execute("DELETE FROM selections WHERE updated_at < ?", (now - SELECTION_TTL,))
+
+    cursor.execute("SELECT COUNT(*) FROM course_selections WHERE token = ?", (token,))
+    return cursor.fetchone()[0]
+
+
+# Solver processes shared by all requests in this worker; created on first use
+_solver_executor = None
+
+
+def get_solver_executor():
+    global _solver_executor
+    if _solver_executor is None:
+        _solver_executor = ProcessPoolExecutor(max_workers=app.config['SOLVER_WORKERS'],
+                                               mp_context=multiprocessing.get_context('spawn'))
+    return _solver_executor
+
+
+def time_solver(name, courses, deadline=None, progress=None, budget=None, catalogue=None):
+    """Run one solver and time only the algorithm; executed inside a solver process.
+
+    `budget` caps the seconds the run may take from when it actually starts, so a partition
+    queued behind others still gets its share of the time before the overall deadline.
+    The caller passes its room catalogue so solver processes don't each load one.
+    """
+    if budget is not None:
+        deadline = min(deadline, time.time() + budget)
+    start_time = time.perf_counter()
+    result = SOLVERS[name](courses, deadline=deadline, progress=progress, catalogue=catalogue)
+    return result, time.perf_counter() - start_time
+
+
+def partition_courses(courses, catalogue, parts):
+    """Split a snapshot into at most `parts` groups of courses that can never compete.
+
+    Solvers keep every course on its day and only offer it its own room or rooms that fit it,
+    so two courses interact only through a teacher or such a room on the same day. Union-find
+    over those resources yields independent components, packed largest first into the smallest
+    group. Courses that fit the same rooms share one node per day, linked to those rooms once.
+    """
+    parent = list(range(len(courses)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    first_user = {}  # (day, kind, teacher, room or fit) -> first course index using it
+    for i, course in enumerate(courses):
+        fit = (course.enrollment or 0, course.required_features)
+        resources = [(course.day_number, 'teacher', course.teacher_name), (course.day_number, 'room', course.room)]
+        if first_user.setdefault((course.day_number, 'fit', fit), i) == i:
+            fitting = catalogue.candidate_rooms(fit[0], parse_features(fit[1]))
+            resources.extend((course.day_number, 'room', room) for room in fitting)
+        else:
+            resources.append((course.day_number, 'fit', fit))
+        for resource in resources:
+            root, other_root = find(i), find(first_user.setdefault(resource, i))
+            if root != other_root:
+                parent[root] = other_root
+
+    components = {}
+    for i, course in enumerate(courses):
+        components.setdefault(find(i), []).append(course)
+    groups = [[] for _ in range(max(1, min(parts, len(components))))]
+    for component in sorted(components.values(), key=len, reverse=True):
+        min(groups, key=len).extend(component)
+    return [tuple(group) for group in groups]
+
+
+# Optimizer stop reasons, least to most urgent; a merged run reports the most urgent one
+OPTIMIZER_STOP_REASONS = ('optimal', 'stalled', 'deadline')
+
+
+def merge_solver_runs(runs):
+    """Combine one solver's (result, seconds) runs over separate partitions into a single run.
+
+    The seconds are summed, so the reported time is solver work rather than wall-clock time.
+    """
+    merged = {'resolved_courses': [], 'unresolved_courses': [], 'timed_out': False, 'stats': {}, 'partitions': len(runs)}
+    for result, _ in runs:
+        merged['resolved_courses'].extend(result.get('resolved_courses', []))
+        merged['unresolved_courses'].extend(result.get('unresolved_courses', []))
+        merged['timed_out'] = merged['timed_out'] or bool(result.get('timed_out'))
+        if result.get('error_message'):
+            merged['error_message'] = result['error_message']
+        for counter, value in result.get('stats', {}).items():
+            merged['stats'][counter] = merged['stats'].get(counter, 0) + value
+        if 'objective' in result:
+            objective = merged.setdefault('objective', {'value': 0, 'unplaced': 0, 'moved': 0, 'shift_minutes': 0,
+                                                        'stopped': OPTIMIZER_STOP_REASONS[0]})
+            for key in ('value', 'unplaced', 'moved', 'shift_minutes'):
+                objective[key] += result['objective'][key]
+            objective['stopped'] = max(objective['stopped'], result['objective']['stopped'],
+                                       key=OPTIMIZER_STOP_REASONS.index)
+    return merged, sum(seconds for _, seconds in runs)
+
+
+def lost_partition_result(name, courses, error_message):
+    """Result for a partition whose solver task never reported back: every course unprocessed.
+
+    The entries follow the solver's own result format, so the merged run still accounts for
+    every course of the selection.
+    """
+    if name == 'backtracking':
+        unresolved_courses = [{
+            'course': course._asdict(),
+            'conflict_info': {'conflicting_course': None, 'conflicting_time': None, 'conflicting_room': None,
+                              'conflict_reason': f"{UNPROCESSED_REASON}: {course.course_title} on {course.day_of_week}."},
+        } for course in courses]
+    else:
+        unresolved_courses = [dict(course._asdict(), conflict=UNPROCESSED_REASON) for course in courses]
+    result = {'resolved_courses': [], 'unresolved_courses': unresolved_courses, 'timed_out': True,
+              'error_message': error_message}
+    if name == 'optimized':
+        result['objective'] = {'value': UNPLACED_COST * len(courses), 'unplaced': len(courses), 'moved': 0,
+                               'shift_minutes': 0, 'stopped': 'deadline'}
+    return result
+
+
+def run_solvers(courses, catalogue, deadline_seconds=None):
+    """Run every solver on the same snapshot in parallel solver processes.
+
+    The snapshot is split into independent partitions (see partition_courses) and every
+    solver runs on each partition as a separate task, so large selections spread over all
+    SOLVER_WORKERS processes. Each task gets a share of the solver time proportional to its
+    size and never runs past the wall-clock deadline; it then stops cooperatively with the
+    best partial assignment found and `timed_out` set. A task that doesn't report back within
+    the grace period is cancelled and its partition is left out of the timed-out result.
+    """
+    deadline_seconds = deadline_seconds or app.config['SOLVER_DEADLINE']
+    deadline = time.time() + deadline_seconds
+    workers = app.config['SOLVER_WORKERS']
+    partitions = partition_courses(courses, catalogue, workers)
+    # The pool offers `workers` seconds of solving per second; each solver gets an equal part
+    seconds_per_course = deadline_seconds * workers / (len(SOLVERS) * max(1, len(courses)))
+    # Queued solver by solver, so the quick greedy tasks never wait behind the longer searches
+    tasks = [(name, partition, seconds_per_course * len(partition)) for name in SOLVERS for partition in partitions]
+
+    global _solver_executor
+    try:
+        futures = [get_solver_executor().submit(time_solver, name, partition, deadline, None, budget, catalogue)
+                   for name, partition, budget in tasks]
+    except (BrokenProcessPool, OSError) as e:
+        # No solver processes available; run in this process rather than fail the request
+        app.logger.warning(f"Solver pool unavailable, solving in-process: {e}")
+        _solver_executor = None
+        futures = [None] * len(tasks)
+
+    runs = {name: [] for name in SOLVERS}
+    for (name, partition, budget), future in zip(tasks, futures):
+        if future is None:
+            runs[name].append(time_solver(name, partition, deadline, None, budget, catalogue))
+            continue
+        try:
+            runs[name].append(future.result(timeout=max(0, deadline + SOLVER_DEADLINE_GRACE - time.time())))
+        except FutureTimeoutError:
+            future.cancel()
+            runs[name].append((lost_partition_result(
+                name, partition, f"The {name} algorithm did not finish within {deadline_seconds:g} seconds."), budget))
+        except BrokenProcessPool as e:
+            # A solver process died; finish this partition in-process and rebuild the pool next time
+            app.logger.warning(f"Solver pool broke while running {name}, solving in-process: {e}")
+            _solver_executor = None
+            runs[name].append(time_solver(name, partition, deadline, None, budget, catalogue))
+
+    results = {name: merge_solver_runs(solver_runs) for name, solver_runs in runs.items()}
+    for name, (result, seconds) in results.items():
+        record_solver_metrics(name, result, seconds)
+    return results
+
+
+class ExpiringLRUCache:
+    """LRU cache with a size bound and a per-entry time to live.
+
+    Callers put the schedule version in their keys, so entries computed before a course was
+    added, edited or deleted are never looked up again and simply age out.
+    """
+
+    def __init__(self, max_entries, ttl_seconds):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (stored_at, value), oldest first
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                self.evictions += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+solver_cache = ExpiringLRUCache(app.config['SOLVER_CACHE_SIZE'], app.config['SOLVER_CACHE_TTL'])
+
+
+def get_schedule_version(conn):
+    """Current schedule version; triggers on course_schedule and rooms bump it on every insert, update and delete."""
+    row = conn.execute("SELECT value FROM schedule_meta WHERE key = 'schedule_version'").fetchone()
+    return row['value'] if row else 0
+
+
+def solve_selection(conn, selected_courses_ids):
+    """Run both solvers on the selected courses, reusing a cached result for the same selection and schedule."""
+    key = (tuple(sorted({int(course_id) for course_id in selected_courses_ids})), get_schedule_version(conn))
+    solver_results = solver_cache.get(key)
+    if solver_results is None:
+        courses = fetch_course_snapshot(conn, key[0])
+        solver_results = run_solvers(courses, get_room_catalogue(conn))
+        # A timed-out run depends on machine load, so let the next request try again
+        if not any(result.get('timed_out') for result, _ in solver_results.values()):
+            solver_cache.put(key, solver_results)
+    return solver_results
+
+
+# Route exposing the solver cache counters
+@app.route('/solver_cache', methods=['GET'])
+def solver_cache_stats():
+    return jsonify(solver_cache.stats())
+
+
+def sample_courses(courses, count):
+    """An evenly spaced, deterministic subset of a snapshot, kept in snapshot order."""
+    return tuple(courses[(i * len(courses)) // count] for i in range(count))
+
+
+def median_interval(values):
+    """Median of the values and a distribution-free ~95% confidence interval around it."""
+    ordered = sorted(values)
+    n = len(ordered)
+    half_width = 1.96 * math.sqrt(n) / 2
+    low = max(0, math.floor(n / 2 - half_width))
+    high = min(n - 1, math.ceil(n / 2 + half_width) - 1)
+    return statistics.median(ordered), ordered[low], ordered[high]
+
+
+def hit_deadline(result):
+    """Whether a run was cut short: searches report timed_out, the optimizer the reason it stopped."""
+    return bool(result.get('timed_out')) or result.get('objective', {}).get('stopped') == 'deadline'
+
+
+def fit_growth(points, value):
+    """Least-squares exponent b of value ≈ a * n^b on a log-log scale; None with fewer than two usable points."""
+    usable = [(math.log(point['courses']), math.log(point[value])) for point in points
+              if point['courses'] > 1 and point[value] and not point['timed_out_runs']]
+    if len(usable) < 2:
+        return None
+    mean_x = sum(x for x, _ in usable) / len(usable)
+    mean_y = sum(y for _, y in usable) / len(usable)
+    spread = sum((x - mean_x) ** 2 for x, _ in usable)
+    if not spread:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in usable) / spread
+
+
+def measure_solver(name, courses, catalogue, repeats=COMPARE_REPEATS, warmup=COMPARE_WARMUP_RUNS, run_deadline=COMPARE_RUN_DEADLINE):
+    """Time one solver over growing subsets of a snapshot; executed inside a solver process.
+
+    Each size gets `warmup` untimed runs, then `repeats` timed ones with their own deadline.
+    Returns the per-size median, confidence interval and operation counts, plus the growth
+    exponents fitted to the runtime and to the total operation count.
+    """
+    sizes = sorted({max(1, round(len(courses) * fraction)) for fraction in COMPARE_SIZE_FRACTIONS})
+    points = []
+    for size in sizes:
+        subset = sample_courses(courses, size)
+        for _ in range(warmup):
+            time_solver(name, subset, time.time() + run_deadline, catalogue=catalogue)
+
+        timings, timed_out_runs = [], 0
+        for _ in range(repeats):
+            result, seconds = time_solver(name, subset, time.time() + run_deadline, catalogue=catalogue)
+            timings.append(seconds)
+            timed_out_runs += hit_deadline(result)
+        median, ci_low, ci_high = median_interval(timings)
+        stats = result.get('stats', {})
+        points.append({
+            'courses': size,
+            'median': median,
+            'ci_low': ci_low,
+            'ci_high': ci_high,
+            'operations': sum(stats.values()),
+            'stats': stats,
+            'timed_out_runs': timed_out_runs,
+        })
+
+    return {
+        'points': points,
+        'time_exponent': fit_growth(points, 'median'),
+        'operations_exponent': fit_growth(points, 'operations'),
+    }
+
+
+def measure_solvers(courses, catalogue):
+    """Measure every solver in parallel solver processes, falling back to this process."""
+    global _solver_executor
+    sizes = len(COMPARE_SIZE_FRACTIONS)
+    budget = sizes * (COMPARE_REPEATS + COMPARE_WARMUP_RUNS) * (COMPARE_RUN_DEADLINE + SOLVER_DEADLINE_GRACE)
+    try:
+        futures = {name: get_solver_executor().submit(measure_solver, name, courses, catalogue) for name in SOLVERS}
+        return {name: future.result(timeout=budget) for name, future in futures.items()}
+    except (BrokenProcessPool, OSError) as e:
+        app.logger.warning(f"Solver pool unavailable, measuring in-process: {e}")
+        _solver_executor = None
+        return {name: measure_solver(name, courses, catalogue) for name in SOLVERS}
+
+
 # Resolve Conflicts through Both Greedy and Backtracking
 @app.route('/resolve_conflicts', methods=['POST'])
 def resolve_conflicts():
-    selected_courses_ids = session.get('selected_courses', [])
-    app.logger.debug(f"Selected courses IDs from session: {selected_courses_ids}")
+    with get_db_connection() as conn:
+        selected_courses_ids = load_selection(conn)
+    app.logger.debug(f"Selected course IDs: {len(selected_courses_ids)} course(s)")
 
     # Check if any courses are selected
     if not selected_courses_ids:
@@ -72,73 +1025,87 @@ def resolve_conflicts():
         return redirect(url_for('course_schedule'))
 
     try:
-        # Measure execution time for Greedy algorithm
-        start_time = time.perf_counter()
-        greedy_result = resolve_conflicts_greedy(selected_courses_ids)
-        greedy_execution_time = time.perf_counter() - start_time
+        # Both algorithms share one snapshot; a repeated selection is served from the solver cache
+        with get_db_connection() as conn:
+            solver_results = solve_selection(conn, selected_courses_ids)
+        context = build_resolution_context(solver_results)
 
-        # Measure execution time for Backtracking algorithm
-        start_time = time.perf_counter()
-        backtracking_result = resolve_conflicts_backtracking(selected_courses_ids)
-        backtracking_execution_time = time.perf_counter() - start_time
+    except Exception as e:
+        app.logger.error(f"Error during conflict resolution: {str(e)}")
+        flash(f"An error occurred: {str(e)}", "danger")
+        return redirect(url_for('course_schedule'))
 
-        # Handle error in backtracking result
-        if not isinstance(backtracking_result, dict):
-            backtracking_result = {'resolved_courses': [], 'unresolved_courses': [], 'error_message': "Error resolving conflicts using backtracking."}
+    # Return results to the template, do not pass `comparison` here
+    return stream_page('resolve_conflicts.html', **context)
 
-        # Set backtracking messages
-        backtracking_result['resolved_message'] = "Conflicts resolved by backtracking." if backtracking_result['resolved_courses'] else "Backtracking couldn't resolve conflicts."
-        backtracking_result['unresolved_message'] = "No unresolved conflicts after backtracking." if not backtracking_result['unresolved_courses'] else "Unresolved conflicts after backtracking."
 
-        # Handle error in greedy result
-        if 'resolved_courses' not in greedy_result:
-            greedy_result = {'resolved_courses': [], 'unresolved_courses': [], 'error_message': "Error resolving conflicts using the greedy algorithm."}
+def build_resolution_context(solver_results):
+    """Turn run_solvers output into the resolve_conflicts.html context (also stored by solve jobs)."""
+    greedy_result, greedy_execution_time = solver_results['greedy']
+    backtracking_result, backtracking_execution_time = solver_results['backtracking']
 
-        # Set greedy messages
-        greedy_result['resolved_message'] = "Conflicts resolved by greedy algorithm." if greedy_result['resolved_courses'] else "Greedy couldn't resolve conflicts."
-        greedy_result['unresolved_message'] = "No unresolved conflicts after greedy algorithm." if not greedy_result['unresolved_courses'] else "Unresolved conflicts after greedy algorithm."
+    # Handle error in backtracking result
+    if not isinstance(backtracking_result, dict):
+        backtracking_result = {'resolved_courses': [], 'unresolved_courses': [], 'error_message': "Error resolving conflicts using backtracking."}
 
-        # Determine which algorithm performed better
-        best_algorithm = determine_best_algorithm(greedy_result, backtracking_result, greedy_execution_time, backtracking_execution_time)
+    # Set backtracking messages
+    backtracking_result['resolved_message'] = "Conflicts resolved by backtracking." if backtracking_result['resolved_courses'] else "Backtracking couldn't resolve conflicts."
+    backtracking_result['unresolved_message'] = "No unresolved conflicts after backtracking." if not backtracking_result['unresolved_courses'] else "Unresolved conflicts after backtracking."
 
-    except Exception as e:
-        app.logger.error(f"Error during conflict resolution: {str(e)}")
-        flash(f"An error occurred: {str(e)}", "danger")
-        return redirect(url_for('course_schedule'))
+    # Handle error in greedy result
+    if 'resolved_courses' not in greedy_result:
+        greedy_result = {'resolved_courses': [], 'unresolved_courses': [], 'error_message': "Error resolving conflicts using the greedy algorithm."}
 
-    # Return results to the template, do not pass `comparison` here
-    return render_template('resolve_conflicts.html', 
-                           greedy_result=greedy_result, 
-                           backtracking_result=backtracking_result,
-                           greedy_execution_time=greedy_execution_time,
-                           backtracking_execution_time=backtracking_execution_time,
-                           best_algorithm=best_algorithm)
+    # Set greedy messages
+    greedy_result['resolved_message'] = "Conflicts resolved by greedy algorithm." if greedy_result['resolved_courses'] else "Greedy couldn't resolve conflicts."
+    greedy_result['unresolved_message'] = "No unresolved conflicts after greedy algorithm." if not greedy_result['unresolved_courses'] else "Unresolved conflicts after greedy algorithm."
+
+    # The optimizer reports how disruptive its schedule is rather than a simple placed count
+    optimized_result, optimized_execution_time = solver_results['optimized']
+
+    # Determine which algorithm performed better
+    best_algorithm = determine_best_algorithm(greedy_result, backtracking_result, greedy_execution_time, backtracking_execution_time)
+
+    return {
+        'greedy_result': greedy_result,
+        'backtracking_result': backtracking_result,
+        'optimized_result': optimized_result,
+        'greedy_execution_time': greedy_execution_time,
+        'backtracking_execution_time': backtracking_execution_time,
+        'optimized_execution_time': optimized_execution_time,
+        'best_algorithm': best_algorithm,
+    }
 
 
 @app.route('/compare_algorithms', methods=['POST'])
 def compare_algorithms():
-    selected_courses_ids = session.get('selected_courses', [])
+    with get_db_connection() as conn:
+        selected_courses_ids = load_selection(conn)
 
     if not selected_courses_ids:
         flash("No courses selected.", "info")
         return redirect(url_for('course_schedule'))
 
     try:
-        # Measure execution time for Greedy algorithm
-        start_time = time.perf_counter()
-        greedy_result = resolve_conflicts_greedy(selected_courses_ids)
-        greedy_execution_time = time.perf_counter() - start_time
+        # Both algorithms share one snapshot; a repeated selection is served from the solver cache
+        with get_db_connection() as conn:
+            solver_results = solve_selection(conn, selected_courses_ids)
 
-        # Measure execution time for Backtracking algorithm
-        start_time = time.perf_counter()
-        backtracking_result = resolve_conflicts_backtracking(selected_courses_ids)
-        backtracking_execution_time = time.perf_counter() - start_time
+            # Measured scaling: repeated runs over growing subsets, cached like the results
+            key = ('compare', tuple(selected_courses_ids), get_schedule_version(conn))
+            measurements = solver_cache.get(key)
+            if measurements is None:
+                measurements = measure_solvers(fetch_course_snapshot(conn, selected_courses_ids), get_room_catalogue(conn))
+                solver_cache.put(key, measurements)
 
-        # Complexity analysis for both algorithms
-        comparison = generate_comparison_data(greedy_result, backtracking_result, greedy_execution_time, backtracking_execution_time)
+        comparison = generate_comparison_data(solver_results, measurements)
 
-        # Determine which algorithm is the best
-        best_algorithm = determine_best_algorithm(greedy_result, backtracking_result, greedy_execution_time, backtracking_execution_time)
+        # Determine which algorithm is the best from the median timings rather than a single run
+        greedy_result, _ = solver_results['greedy']
+        backtracking_result, _ = solver_results['backtracking']
+        best_algorithm = determine_best_algorithm(greedy_result, backtracking_result,
+                                                  comparison['metrics']['greedy']['execution_time'],
+                                                  comparison['metrics']['backtracking']['execution_time'])
 
         return render_template('compare_algorithms.html', 
                                comparison=comparison, 
@@ -150,34 +1117,189 @@ def compare_algorithms():
         return redirect(url_for('course_schedule'))
 
 
-def generate_comparison_data(greedy_result, backtracking_result, greedy_execution_time, backtracking_execution_time):
-    """Generate the comparison data including complexity analysis for both algorithms."""
+# Background solve jobs: the request only records the job, a job process solves it and stores the result
+_job_executor = None
+
+# Seconds between progress writes from a running job
+SOLVE_JOB_PROGRESS_INTERVAL = 0.5
+# Seconds a running job may take past the deadlines of all its solvers before it counts as lost
+SOLVE_JOB_STALE_GRACE = 60.0
+
+
+def get_job_executor():
+    global _job_executor
+    if _job_executor is None:
+        _job_executor = ProcessPoolExecutor(max_workers=app.config['SOLVE_JOB_WORKERS'],
+                                            mp_context=multiprocessing.get_context('spawn'))
+    return _job_executor
+
+
+def run_solve_job(job_id, db_path, deadline_seconds):
+    """Solve a queued job inside a job process, writing progress and the result to solve_jobs."""
+    conn = open_db_connection(db_path)
+    try:
+        row = conn.execute("SELECT course_ids FROM solve_jobs WHERE id = ?", (job_id,)).fetchone()
+        with conn:
+            started = conn.execute("UPDATE solve_jobs SET status = 'running', started_at = ? WHERE id = ? AND status = 'queued'",
+                                   (time.time(), job_id)).rowcount
+        if not started:
+            return  # Already failed as stale while it waited in the queue
+        courses = fetch_course_snapshot(conn, json.loads(row['course_ids']))
+        # Partitions are solved one after another here; each still gets time in proportion to its size
+        catalogue = get_room_catalogue(conn)
+        partitions = partition_courses(courses, catalogue, app.config['SOLVER_WORKERS'])
+
+        solver_results = {}
+        for name in SOLVERS:
+            last_report = 0.0
+            deadline = time.time() + deadline_seconds
+            runs = []
+            for partition in partitions:
+                placed_before = sum(len(run['resolved_courses']) for run, _ in runs)
+
+                def report_progress(nodes_explored, courses_placed, name=name, placed_before=placed_before):
+                    nonlocal last_report
+                    now = time.time()
+                    if now - last_report >= SOLVE_JOB_PROGRESS_INTERVAL:
+                        last_report = now
+                        with conn:
+                            conn.execute("""
+                                UPDATE solve_jobs SET current_solver = ?, nodes_explored = ?, courses_placed = ?
+                                WHERE id = ?
+                            """, (name, nodes_explored, placed_before + courses_placed, job_id))
+
+                budget = deadline_seconds * len(partition) / max(1, len(courses))
+                runs.append(time_solver(name, partition, deadline, report_progress, budget, catalogue))
+            solver_results[name] = merge_solver_runs(runs)
+
+        context = build_resolution_context(solver_results)
+        with conn:
+            conn.execute("""
+                UPDATE solve_jobs SET status = 'done', finished_at = ?, result = ?,
+                    courses_placed = ?, current_solver = NULL
+                WHERE id = ?
+            """, (time.time(), json.dumps(context), len(context['backtracking_result']['resolved_courses']), job_id))
+    except Exception as e:
+        with conn:
+            conn.execute("UPDATE solve_jobs SET status = 'failed', finished_at = ?, error = ? WHERE id = ?",
+                         (time.time(), str(e), job_id))
+    finally:
+        conn.close()
+
+
+def load_solve_job(conn, job_id):
+    """Load a solve job, first marking it failed if its job process is gone.
+
+    Every solver stops at SOLVE_JOB_DEADLINE, so a job still running SOLVE_JOB_STALE_GRACE
+    seconds after all of them would have stopped lost its process to a crash or a restart.
+    A job still queued after SOLVE_JOB_QUEUE_TIMEOUT was never picked up.
+    """
+    now = time.time()
+    running_since = now - app.config['SOLVE_JOB_DEADLINE'] * len(SOLVERS) - SOLVE_JOB_STALE_GRACE
+    queued_since = now - app.config['SOLVE_JOB_QUEUE_TIMEOUT']
+    with conn:
+        conn.execute("""
+            UPDATE solve_jobs SET status = 'failed', finished_at = ?,
+                error = CASE status WHEN 'running' THEN ? ELSE ? END
+            WHERE id = ? AND (status = 'running' AND started_at < ? OR status = 'queued' AND created_at < ?)
+        """, (now, "The job stopped before finishing; its worker may have crashed or restarted.",
+              "The job was never started; its worker may have restarted.", job_id, running_since, queued_since))
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM solve_jobs WHERE id = ?", (job_id,))
+    return cursor.fetchone()
+
+
+def solve_job_status(job):
+    """JSON-friendly progress summary of a solve job row."""
     return {
-        "metrics": {
-            "greedy": {
-                "resolved": len(greedy_result['resolved_courses']),
-                "unresolved": len(greedy_result['unresolved_courses']),
-                "execution_time": greedy_execution_time,
-                "best_case": "O(n)",
-                "worst_case": "O(n * m)",
-                "average_case": "O(n log n)"
-            },
-            "backtracking": {
-                "resolved": len(backtracking_result['resolved_courses']),
-                "unresolved": len(backtracking_result['unresolved_courses']),
-                "execution_time": backtracking_execution_time,
-                "best_case": "O(n)",
-                "worst_case": "O(n!)",
-                "average_case": "O(n * m^n)"
-            }
-        },
-        "results": {
-            "greedy": greedy_result,
-            "backtracking": backtracking_result
-        }
+        'id': job['id'],
+        'status': job['status'],
+        'course_count': job['course_count'],
+        'current_solver': job['current_solver'],
+        'nodes_explored': job['nodes_explored'],
+        'courses_placed': job['courses_placed'],
+        'created_at': job['created_at'],
+        'started_at': job['started_at'],
+        'finished_at': job['finished_at'],
+        'error': job['error'],
+        'result_url': url_for('solve_job', job_id=job['id']),
     }
 
 
+# Route to start resolving the selected courses in the background
+@app.route('/solve_jobs', methods=['POST'])
+def create_solve_job():
+    with get_db_connection() as conn:
+        selected_courses_ids = load_selection(conn)
+    if not selected_courses_ids:
+        flash("No courses selected yet.", "info")
+        return redirect(url_for('course_schedule'))
+
+    job_id = uuid.uuid4().hex
+    try:
+        with get_db_connection() as conn:
+            conn.execute("""
+                INSERT INTO solve_jobs (id, status, course_ids, course_count, created_at)
+                VALUES (?, 'queued', ?, ?, ?)
+            """, (job_id, json.dumps(selected_courses_ids), len(selected_courses_ids), time.time()))
+        get_job_executor().submit(run_solve_job, job_id, app.config['DATABASE'], app.config['SOLVE_JOB_DEADLINE'])
+    except (sqlite3.Error, BrokenProcessPool, OSError) as e:
+        app.logger.error(f"Error starting solve job: {str(e)}")
+        flash(f"Could not start conflict resolution: {e}", "danger")
+        return redirect(url_for('course_schedule'))
+
+    if request.accept_mimetypes.best == 'application/json':
+        return jsonify({'job_id': job_id, 'status_url': url_for('solve_job_status_view', job_id=job_id)}), 202
+    return redirect(url_for('solve_job', job_id=job_id))
+
+
+# Route to show a solve job: progress while it runs, the stored result once it is done
+@app.route('/solve_jobs/<job_id>', methods=['GET'])
+def solve_job(job_id):
+    with get_db_connection() as conn:
+        job = load_solve_job(conn, job_id)
+
+    if job is None:
+        flash("Conflict resolution job not found.", "danger")
+        return redirect(url_for('course_schedule'))
+    if job['status'] == 'done':
+        return stream_page('resolve_conflicts.html', **json.loads(job['result']))
+    return render_template('solve_job.html', job=solve_job_status(job))
+
+
+# Route polled for a solve job's progress
+@app.route('/solve_jobs/<job_id>/status', methods=['GET'])
+def solve_job_status_view(job_id):
+    with get_db_connection() as conn:
+        job = load_solve_job(conn, job_id)
+
+    if job is None:
+        return jsonify({'error': "Job not found."}), 404
+    return jsonify(solve_job_status(job))
+
+
+def generate_comparison_data(solver_results, measurements):
+    """Combine the full-selection results with the measured timings and growth of each solver."""
+    metrics = {}
+    for name, (result, _) in solver_results.items():
+        measurement = measurements[name]
+        full_size = measurement['points'][-1]
+        metrics[name] = {
+            "resolved": len(result['resolved_courses']),
+            "unresolved": len(result['unresolved_courses']),
+            "execution_time": full_size['median'],
+            "ci_low": full_size['ci_low'],
+            "ci_high": full_size['ci_high'],
+            "stats": full_size['stats'],
+            "time_exponent": measurement['time_exponent'],
+            "operations_exponent": measurement['operations_exponent'],
+            "points": measurement['points'],
+        }
+    return {
+        "metrics": metrics,
+        "results": {name: result for name, (result, _) in solver_results.items()}
+    }
+
 
 def determine_best_algorithm(greedy_result, backtracking_result, greedy_execution_time, backtracking_execution_time):
     """Determine the best algorithm based on resolved courses, unresolved courses, and execution time."""
@@ -200,238 +1322,927 @@ def determine_best_algorithm(greedy_result, backtracking_result, greedy_executio
 
     
 
-def resolve_conflicts_backtracking(selected_courses_ids):
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-        query = "SELECT id, teacher_name, course_title, day_of_week, class_start_time, class_end_time, room FROM course_schedule WHERE id IN ({})".format(
-            ','.join('?' for _ in selected_courses_ids)
-        )
-        cursor.execute(query, tuple(selected_courses_ids))
-        selected_courses = cursor.fetchall()
-
-    # Convert sqlite3.Row objects to dictionaries
-    selected_courses = [dict(course) for course in selected_courses]
-
-    # Sort courses by day and start time
-    selected_courses.sort(key=lambda x: (x['day_of_week'], x['class_start_time']))
+def resolve_conflicts_backtracking(courses, deadline=None, progress=None, catalogue=None):
+    """Resolve conflicts in a course snapshot using a bitset branch-and-bound search."""
+    search = BitsetSearch(courses, catalogue or get_room_catalogue(), deadline=deadline, progress=progress)
+    search.run()
+    return search.result()
+
+
+# Bitset time-slot helper: a day is a row of SLOT_MINUTES slots, an interval is an int mask.
+def slot_mask(start_minutes, end_minutes):
+    """Bitmask covering every slot touched by [start_minutes, end_minutes)."""
+    first_slot = start_minutes // SLOT_MINUTES
+    last_slot = -(-end_minutes // SLOT_MINUTES)  # Round the end up so partial slots count as busy
+    return ((1 << (last_slot - first_slot)) - 1) << first_slot
+
+
+# Solver input: the snapshot as parallel integer columns, built once per solve
+class CourseColumns:
+    """Day, start, end, room id and teacher id of every course in parallel arrays.
+
+    Rooms and teachers are interned to small ids, so the solvers' inner loops compare ints
+    and key their bookings by a single int (`id << 3 | day`, days being 1..7) instead of
+    building tuples. The Course records stay in `courses` and only become dicts when a
+    solver builds its result.
+    """
+    __slots__ = ('courses', 'catalogue', 'day', 'start', 'end', 'room', 'teacher', 'rooms', '_room_ids', '_catalogue_ids',
+                 '_options')
+
+    def __init__(self, courses, catalogue):
+        self.courses = courses
+        self.catalogue = catalogue
+        self.rooms = []  # Room id -> room as stored in the schedule
+        self._room_ids = {}
+        self._catalogue_ids = {}  # (enrollment, features) -> interned catalogue candidates
+        self._options = {}        # (room id, start, end, shift) -> shared option tuple
+        teacher_ids = {}
+        self.day = array('i', (course.day_number for course in courses))
+        self.start = array('i', (course.start_minute for course in courses))
+        self.end = array('i', (course.end_minute for course in courses))
+        self.room = array('i', (self.room_id(course.room) for course in courses))
+        self.teacher = array('i', (teacher_ids.setdefault(course.teacher_name, len(teacher_ids)) for course in courses))
+
+    def room_id(self, room):
+        room_id = self._room_ids.get(room)
+        if room_id is None:
+            room_id = self._room_ids[room] = len(self.rooms)
+            self.rooms.append(room)
+        return room_id
+
+    def fitting(self, i):
+        """Ids of every catalogue room that fits course i, smallest first; shared between courses."""
+        course = self.courses[i]
+        key = (course.enrollment or 0, course.required_features)
+        fitting = self._catalogue_ids.get(key)
+        if fitting is None:
+            rooms = self.catalogue.candidate_rooms(key[0], parse_features(key[1]))
+            fitting = self._catalogue_ids[key] = tuple(map(self.room_id, rooms))
+        return fitting
+
+    def candidates(self, i):
+        """Candidate room ids for the search solvers: course i's own room, then its candidate_window."""
+        room = self.room[i]
+        return (room,) + tuple(room_id for room_id in candidate_window(self.fitting(i), self.courses[i].id) if room_id != room)
+
+    def options(self, i):
+        """(room id, slot mask, start shift) options for course i, least disruptive first.
+
+        Courses at the same time share their option tuples (and masks), so a large selection
+        keeps one copy of each distinct placement. Solvers must not mutate the returned list.
+        """
+        start, end = self.start[i], self.end[i]
+        rooms = self.candidates(i)
+        values = []
+        shift = 0
+        while shift == 0 or end + shift <= BACKTRACK_DAY_END:
+            mask = None
+            for room in rooms:
+                key = (room, start, end, shift)
+                value = self._options.get(key)
+                if value is None:
+                    if mask is None:
+                        mask = slot_mask(start + shift, end + shift)
+                    value = self._options[key] = (room, mask, shift)
+                values.append(value)
+            shift += BACKTRACK_SHIFT_MINUTES
+        return values
+
+
+class _SearchFrame:
+    __slots__ = ('course', 'values', 'position', 'trail_mark', 'applied')
+
+    def __init__(self, course, values, trail_mark):
+        self.course = course
+        self.values = values
+        self.position = 0
+        self.trail_mark = trail_mark
+        self.applied = None
+
+
+class BitsetSearch:
+    """Branch-and-bound search that places as many courses as possible.
+
+    Every option is a (room id, slot mask, shift) triple, so a clash check is a single
+    AND on the masks. Courses are picked most-constrained first
+    (MRV, ties broken by degree), every placement forward-checks the domains of
+    the courses it can clash with, and the search stops at a node or time budget
+    while keeping the best assignment found so far. The first-fit placement is the
+    first incumbent, so a search stopped early never places fewer courses than greedy.
+
+    The courses a placement can clash with are found through buckets: per (day, teacher)
+    and per (day, candidate room). Building them is linear in the options, and the
+    deadline is checked while they are built; if it passes, the search never starts and
+    the first-fit incumbent is the result.
+    """
+
+    def __init__(self, courses, catalogue, deadline=None, progress=None, node_budget=None):
+        self.courses = courses
+        if deadline is None:
+            deadline = time.time() + BACKTRACK_TIME_BUDGET
+            node_budget = node_budget or BACKTRACK_NODE_BUDGET
+        self.node_budget = node_budget or float('inf')
+        self.deadline = time.perf_counter() + (deadline - time.time())  # Wall-clock deadline, checked cheaply
+        self.progress = progress
+        self.nodes = 0
+        self.backtracks = 0
+        self.pruned = 0
+        self.placements = 0
+        self.complete = False
+
+        count = len(courses)
+        self.columns = CourseColumns(courses, catalogue)
+        self.days = self.columns.day
+        self.teachers = self.columns.teacher
+        self.assignment = [None] * count
+        self.unassigned = set(range(count))
+        self.trail = []
+        self.placed = 0
+        self.best_placed = -1
+        self.best_assignment = list(self.assignment)
+        self._seed_incumbent()
+        self.ready = self._build_domains()
+
+    def _build_domains(self):
+        """Build every course's options and the teacher and room buckets; False if the deadline passed first."""
+        columns = self.columns
+        self.domains = []
+        self.teacher_buckets = {}  # teacher id << 3 | day -> courses of that teacher on that day
+        self.room_buckets = {}     # room id << 3 | day -> courses that may use that room on that day
+        for i in range(len(self.courses)):
+            if i % PROGRESS_INTERVAL_NODES == 0 and time.perf_counter() >= self.deadline:
+                return False
+            day = self.days[i]
+            self.domains.append(columns.options(i))
+            self.teacher_buckets.setdefault(self.teachers[i] << 3 | day, []).append(i)
+            for room in columns.candidates(i):
+                self.room_buckets.setdefault(room << 3 | day, []).append(i)
+
+        # Degree, the MRV tie-break: how many courses share a bucket with the course (counting repeats)
+        self.degrees = [
+            len(self.teacher_buckets[self.teachers[i] << 3 | self.days[i]])
+            + sum(len(self.room_buckets[room << 3 | self.days[i]]) for room in columns.candidates(i))
+            for i in range(len(self.courses))
+        ]
+        return True
 
-    # Initialize containers
-    assigned_courses = []
-    available_times = {}
-    unresolved_courses_with_conflicts = []
+    def _seed_incumbent(self):
+        """Take the first-fit placement as the best assignment so far.
+
+        It runs without the deadline: it costs less than building the domains, and first fit
+        may use any fitting room, so the search only replaces it by placing more courses.
+        """
+        _, assigned_rooms, _, _, _ = place_first_fit(self.columns)
+        for i, room in enumerate(assigned_rooms):
+            if room >= 0:
+                self.best_assignment[i] = (room, slot_mask(self.columns.start[i], self.columns.end[i]), 0)
+        self.best_placed = sum(room >= 0 for room in assigned_rooms)
+
+    def _out_of_budget(self):
+        return self.nodes >= self.node_budget or time.perf_counter() >= self.deadline
+
+    def _pick_course(self):
+        """Return (most constrained unassigned course, upper bound on further placements)."""
+        best = None
+        best_key = None
+        placeable = 0
+        scale = len(self.courses) + 1  # Domain size first, then higher degree: one int key, no tuple per course
+        for i in self.unassigned:
+            size = len(self.domains[i])
+            if size:
+                placeable += 1
+            key = size * scale - self.degrees[i]
+            if best_key is None or key < best_key:
+                best, best_key = i, key
+        return best, placeable
+
+    def _apply(self, i, value):
+        room, mask, _ = value
+        teacher = self.teachers[i]
+        self.assignment[i] = value
+        self.placed += 1
+        self.placements += 1
+
+        # Forward checking: drop options that now clash for this teacher or in this room
+        day = self.days[i]
+        for j, same_teacher in itertools.chain(
+                zip(self.teacher_buckets[teacher << 3 | day], itertools.repeat(True)),
+                zip(self.room_buckets[room << 3 | day], itertools.repeat(False))):
+            if j not in self.unassigned:
+                continue
+            domain = self.domains[j]
+            if same_teacher:
+                pruned = [option for option in domain if not option[1] & mask]
+            else:
+                pruned = [option for option in domain if not (option[0] == room and option[1] & mask)]
+            if len(pruned) != len(domain):
+                self.pruned += len(domain) - len(pruned)
+                self.trail.append((j, domain))
+                self.domains[j] = pruned
+
+    def _undo(self, frame):
+        while len(self.trail) > frame.trail_mark:
+            j, domain = self.trail.pop()
+            self.domains[j] = domain
+        if frame.applied is not None:
+            self.assignment[frame.course] = None
+            self.placed -= 1
+            frame.applied = None
+
+    def _next_option(self, frame):
+        """Move a frame to its next option; the final option leaves the course unplaced."""
+        if frame.position:
+            self._undo(frame)
+            self.backtracks += 1
+        if frame.position < len(frame.values):
+            frame.applied = frame.values[frame.position]
+            self._apply(frame.course, frame.applied)
+        elif frame.position > len(frame.values):
+            return False
+        frame.position += 1
+        return True
 
-    # Resolve conflicts using backtracking
-    backtrack(selected_courses, 0, assigned_courses, available_times, unresolved_courses_with_conflicts)
+    def _record_if_better(self):
+        if self.placed > self.best_placed:
+            self.best_placed = self.placed
+            self.best_assignment = list(self.assignment)
+
+    def run(self):
+        if not self.ready:
+            return  # The deadline passed while building the domains; the first-fit incumbent stands
+        stack = []
+        while True:
+            if self._out_of_budget():
+                # The assignment being explored is itself valid; keep it if it beats the best leaf
+                self._record_if_better()
+                return
+            self.nodes += 1
+            if self.progress and self.nodes % PROGRESS_INTERVAL_NODES == 0:
+                self.progress(self.nodes, max(self.best_placed, self.placed))
+
+            course, placeable = self._pick_course()
+            if course is None:
+                self._record_if_better()
+                if self.best_placed == len(self.courses):
+                    self.complete = True
+                    return
+            elif self.placed + placeable > self.best_placed:
+                self.unassigned.discard(course)
+                stack.append(_SearchFrame(course, self.domains[course], len(self.trail)))
+
+            # Advance the deepest frame that still has an untried option
+            while stack and not self._next_option(stack[-1]):
+                self.unassigned.add(stack.pop().course)
+            if not stack:
+                self.complete = True
+                return
+
+    def _blocking_course(self, i, placed_by_key):
+        """Find a placed course that occupies course i's original room or teacher."""
+        teacher = self.teachers[i]
+        room = self.columns.room[i]
+        day = self.days[i]
+        mask = slot_mask(self.columns.start[i], self.columns.end[i])
+        for j in heapq.merge(placed_by_key['room'].get(room << 3 | day, ()),
+                             placed_by_key['teacher'].get(teacher << 3 | day, ())):
+            value = self.best_assignment[j]
+            if value and value[1] & mask and (value[0] == room or self.teachers[j] == teacher):
+                return self._placed_course(j, value), ("Teacher double-booked" if self.teachers[j] == teacher else "Room occupied")
+        return None, "No room or time slot left"
+
+    def _placed_course(self, i, value):
+        room, _, shift = value
+        course = self.courses[i]._asdict()
+        course['room'] = self.columns.rooms[room]
+        if shift:
+            course['start_minute'] += shift
+            course['end_minute'] += shift
+            course['class_start_time'] = format_time(course['start_minute'])
+            course['class_end_time'] = format_time(course['end_minute'])
+        return course
+
+    def result(self):
+        # Placed courses per (day, room) and per (day, teacher), in index order, to name blockers
+        placed_by_key = {'room': {}, 'teacher': {}}
+        for j, value in enumerate(self.best_assignment):
+            if value is not None:
+                placed_by_key['room'].setdefault(value[0] << 3 | self.days[j], []).append(j)
+                placed_by_key['teacher'].setdefault(self.teachers[j] << 3 | self.days[j], []).append(j)
+
+        resolved_courses = []
+        unresolved_courses = []
+        for i, course in enumerate(self.courses):
+            value = self.best_assignment[i]
+            if value is not None:
+                resolved_courses.append(self._placed_course(i, value))
+                continue
+            blocker, reason = self._blocking_course(i, placed_by_key)
+            unresolved_courses.append({
+                'course': course._asdict(),
+                'conflict_info': {
+                    'conflicting_course': blocker['course_title'] if blocker else None,
+                    'conflicting_time': f"{blocker['class_start_time']} - {blocker['class_end_time']}" if blocker else None,
+                    'conflicting_room': blocker['room'] if blocker else None,
+                    'conflict_reason': f"{reason}: unable to find a room or time slot for {course.course_title} on {course.day_of_week}."
+                }
+            })
+        return {
+            'resolved_courses': resolved_courses,
+            'unresolved_courses': unresolved_courses,
+            'timed_out': not self.complete,
+            'stats': {'nodes_explored': self.nodes, 'backtracks': self.backtracks, 'options_pruned': self.pruned,
+                      'placement_attempts': self.placements},
+        }
 
-    return {
-        'resolved_courses': assigned_courses,
-        'unresolved_courses': unresolved_courses_with_conflicts,
-    }
 
+# Sorted, non-overlapping busy intervals for one (day, room) or (day, teacher) key.
+class IntervalIndex:
+    """Keeps busy intervals merged and sorted so an overlap probe is a single bisect."""
+    __slots__ = ('starts', 'ends')
 
-def can_assign_course(course, day_schedule):
-    room = course['room']
-    start_time = course['class_start_time']
-    end_time = course['class_end_time']
+    def __init__(self):
+        self.starts = []
+        self.ends = []
 
-    # Check if the room exists in the day's schedule
-    if room not in day_schedule:
-        return True
+    def overlaps(self, start, end):
+        """Return True if [start, end) intersects any booked interval."""
+        # Every interval left of `i` starts before `end`; because the intervals are
+        # disjoint and sorted, only the last of them can still be running at `start`.
+        i = bisect_left(self.starts, end)
+        return i > 0 and self.ends[i - 1] > start
 
-    # Check for conflicts in the same room
-    for assigned in day_schedule[room]:
-        if not (end_time <= assigned['class_start_time'] or start_time >= assigned['class_end_time']):
-            return False
+    def add(self, start, end):
+        """Book [start, end), merging it with any interval it touches."""
+        lo = bisect_left(self.ends, start)
+        hi = bisect_right(self.starts, end)
+        if lo < hi:
+            start = min(start, self.starts[lo])
+            end = max(end, self.ends[hi - 1])
+        self.starts[lo:hi] = [start]
+        self.ends[lo:hi] = [end]
 
-    return True
+    def __len__(self):
+        return len(self.starts)
 
-def assign_course(course, day_schedule):
-    room = course['room']
-    if room not in day_schedule:
-        day_schedule[room] = []
-    day_schedule[room].append(course)
 
+# Per-(day, room) and per-(day, teacher) interval indexes used while placing courses.
+class ScheduleIndex:
+    """Answers "is this room / teacher free on this day?" in O(log n) per probe."""
 
-def unassign_course(course, day_schedule):
-    room = course['room']
-    if room in day_schedule:
-        day_schedule[room].remove(course)
+    def __init__(self):
+        self.rooms = {}
+        self.teachers = {}
+        self.probes = 0       # Interval checks answered, reported in the solver stats
+        self.room_probes = 0  # Of those, rooms tried for a course
 
+    def _is_free(self, indexes, key, start, end):
+        self.probes += 1
+        index = indexes.get(key)
+        return index is None or not index.overlaps(start, end)
 
-def backtrack(courses, index, assigned_courses, available_times, unresolved_courses):
-    if index >= len(courses):  # Base case: All courses processed
-        return True
+    def room_is_free(self, day, room, start, end):
+        self.room_probes += 1
+        return self._is_free(self.rooms, (day, room), start, end)
 
-    course = courses[index]
-    day = course['day_of_week']
-    original_room = course['room']
-    start_time = course['class_start_time']
-    end_time = course['class_end_time']
-
-    # Ensure the day's schedule is initialized
-    if day not in available_times:
-        available_times[day] = {}
-
-    # Try each available room
-    for room in ["Room 1", "Room 2", "Room 3", "Room 4", "Room 5"]:
-        course['room'] = room
-
-        # Check if the course fits in the current room
-        if can_assign_course(course, available_times[day]):
-            assign_course(course, available_times[day])
-            assigned_courses.append(course.copy())  # Add course to resolved list
-
-            # Recursively assign the next course
-            if backtrack(courses, index + 1, assigned_courses, available_times, unresolved_courses):
-                return True
-
-            # Backtrack: Remove assignment
-            unassign_course(course, available_times[day])
-            assigned_courses.pop()
-
-    # Try shifting the course to a later time slot
-    max_end_time = 18  # Assuming courses must end by 6:00 PM
-    for shift in range(1, max_end_time - start_time + 1):
-        shifted_start_time = start_time + shift
-        shifted_end_time = end_time + shift
-        if shifted_end_time > max_end_time:
-            break
-
-        course['class_start_time'] = shifted_start_time
-        course['class_end_time'] = shifted_end_time
-        course['room'] = original_room  # Reset room to original for this time shift
-
-        # Check all rooms again with the shifted time
-        for room in ["Room 1", "Room 2", "Room 3", "Room 4", "Room 5"]:
-            course['room'] = room
-            if can_assign_course(course, available_times[day]):
-                assign_course(course, available_times[day])
-                assigned_courses.append(course.copy())
-
-                if backtrack(courses, index + 1, assigned_courses, available_times, unresolved_courses):
-                    return True
-
-                # Backtrack
-                unassign_course(course, available_times[day])
-                assigned_courses.pop()
-
-    # If no room or time works, mark as unresolved
-    unresolved_courses.append({
-        'course': course.copy(),
-        'conflict_info': f"Unable to find a room or time slot for {course['course_title']} on {day}."
-    })
-    return False
+    def teacher_is_free(self, day, teacher_name, start, end):
+        return self._is_free(self.teachers, (day, teacher_name), start, end)
 
+    def book(self, day, room, teacher_name, start, end):
+        self.rooms.setdefault((day, room), IntervalIndex()).add(start, end)
+        self.teachers.setdefault((day, teacher_name), IntervalIndex()).add(start, end)
 
-# Greedy Algorithm: Resolves conflicts by selecting the first available room/time slot.
-def resolve_conflicts_greedy(selected_courses_ids):
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
 
-        # Prepare and execute the query with placeholders
-        query = """
-            SELECT id, teacher_name, course_title, day_of_week, class_start_time, class_end_time, room 
-            FROM course_schedule 
-            WHERE id IN ({})
-        """.format(','.join(['?'] * len(selected_courses_ids)))
-        cursor.execute(query, tuple(selected_courses_ids))
-        selected_courses = cursor.fetchall()
-
-    # Map weekdays to numeric values for sorting and comparison
-    DAY_MAP = {
-        'Monday': 1,
-        'Tuesday': 2,
-        'Wednesday': 3,
-        'Thursday': 4,
-        'Friday': 5,
-        'Saturday': 6,
-        'Sunday': 7
-    }
+# First fit in time order, shared by the greedy solver and the backtracking search's first incumbent
+def place_first_fit(columns, deadline=None, progress=None):
+    """Place courses by day and start time in their own room, or else the smallest free room that fits.
 
+    Returns (order, assigned room ids with -1 for unplaced courses, the reason each unplaced
+    course stayed out, courses processed before the deadline, the ScheduleIndex).
+    """
+    count = len(columns.courses)
     # Sort courses by day and start time
-    selected_courses.sort(key=lambda x: (DAY_MAP[x[3]], x[4]))
+    order = sorted(range(count), key=lambda i: (columns.day[i], columns.start[i]))
 
-    resolved_courses = []
-    unresolved_courses = []
+    # Outcome per course: an assigned room id, or -1 and the reason it stayed unplaced
+    assigned_rooms = array('i', [-1]) * count
+    conflicts = [None] * count
+    processed = count
+    placed = 0
 
-    # Room availability tracking
-    room_availability = {day: {room: [] for room in range(1, 6)} for day in range(1, 8)}
+    # Room and teacher availability tracking
+    schedule_index = ScheduleIndex()
 
     # Iterate over each course to check for conflicts and assign rooms
-    for course in selected_courses:
-        course_id, teacher_name, course_title, day_of_week, start_time, end_time, room = course
-        day_numeric = DAY_MAP[day_of_week]
-        conflict = False
-
-        # Check current room availability for conflicts
-        for existing_start, existing_end in room_availability[day_numeric][room]:
-            if not (end_time <= existing_start or start_time >= existing_end):  # Time overlap conflict
-                conflict = True
+    for position, i in enumerate(order):
+        # Every few hundred courses, report progress and stop with what has been placed if the deadline passed
+        if position % 256 == 0:
+            if progress:
+                progress(position, placed)
+            if deadline is not None and time.time() >= deadline:
+                processed = position
                 break
 
-        if conflict:
-            # Try to find an alternative room
-            alternative_room_found = False
-            for alt_room in room_availability[day_numeric]:
-                if alt_room != room:  # Skip the original room
-                    for existing_start, existing_end in room_availability[day_numeric][alt_room]:
-                        if not (end_time <= existing_start or start_time >= existing_end):
-                            break
-                    else:
-                        # Assign to the alternative room if no conflict is found
-                        room_availability[day_numeric][alt_room].append((start_time, end_time))
-                        resolved_courses.append({
-                            'id': course_id,
-                            'course_title': course_title,
-                            'teacher_name': teacher_name,
-                            'day_of_week': day_of_week,
-                            'class_start_time': start_time,
-                            'class_end_time': end_time,
-                            'room': alt_room
-                        })
-                        alternative_room_found = True
-                        break
-
-            if not alternative_room_found:
+        day, start, end, teacher = columns.day[i], columns.start[i], columns.end[i], columns.teacher[i]
+
+        # A teacher can't be in two rooms at once, so moving rooms won't help here
+        if not schedule_index.teacher_is_free(day, teacher, start, end):
+            conflicts[i] = "Teacher is already teaching at this time"
+            continue
+
+        # Keep the original room if it is free, otherwise take the smallest free room that fits
+        room = columns.room[i]
+        if not schedule_index.room_is_free(day, room, start, end):
+            room = next((alt_room for alt_room in columns.fitting(i)
+                         if alt_room != room and schedule_index.room_is_free(day, alt_room, start, end)), None)
+            if room is None:
                 # Record the course as unresolved if no alternative room is found
-                unresolved_courses.append({
-                    'id': course_id,
-                    'course_title': course_title,
-                    'teacher_name': teacher_name,
-                    'day_of_week': day_of_week,
-                    'class_start_time': start_time,
-                    'class_end_time': end_time,
-                    'room': room,
-                    'conflict': "No available room for this time slot"
-                })
+                conflicts[i] = "No available room for this time slot"
+                continue
+
+        schedule_index.book(day, room, teacher, start, end)
+        assigned_rooms[i] = room
+        placed += 1
+
+    return order, assigned_rooms, conflicts, processed, schedule_index
+
+
+# Greedy Algorithm: Resolves conflicts by selecting the first available room/time slot.
+def resolve_conflicts_greedy(courses, deadline=None, progress=None, catalogue=None):
+    columns = CourseColumns(courses, catalogue or get_room_catalogue())
+    order, assigned_rooms, conflicts, processed, schedule_index = place_first_fit(columns, deadline, progress)
+
+    # Only now turn the outcomes into dicts for the templates, in the order the courses were considered
+    resolved_courses = []
+    unresolved_courses = []
+    for position, i in enumerate(order):
+        course = courses[i]
+        if position >= processed:
+            unresolved_courses.append(dict(course._asdict(), conflict=UNPROCESSED_REASON))
+            continue
+        course_details = {
+            'id': course.id,
+            'course_title': course.course_title,
+            'teacher_name': course.teacher_name,
+            'day_of_week': course.day_of_week,
+            'class_start_time': course.class_start_time,
+            'class_end_time': course.class_end_time,
+            'room': course.room
+        }
+        if assigned_rooms[i] < 0:
+            course_details['conflict'] = conflicts[i]
+            unresolved_courses.append(course_details)
         else:
-            # No conflict; assign to the original room
-            room_availability[day_numeric][room].append((start_time, end_time))
-            resolved_courses.append({
-                'id': course_id,
-                'course_title': course_title,
-                'teacher_name': teacher_name,
-                'day_of_week': day_of_week,
-                'class_start_time': start_time,
-                'class_end_time': end_time,
-                'room': room
-            })
+            course_details['room'] = columns.rooms[assigned_rooms[i]]
+            resolved_courses.append(course_details)
 
     # Return the result dictionary
     return {
         'resolved_courses': resolved_courses,
-        'unresolved_courses': unresolved_courses
+        'unresolved_courses': unresolved_courses,
+        'timed_out': processed < len(courses),
+        'stats': {'interval_checks': schedule_index.probes, 'placement_attempts': schedule_index.room_probes},
     }
+
+
+# Optimization mode: local search that minimises disruption rather than stopping at a first fit
+OPTIMIZER_TIME_BUDGET = 2.0       # Seconds of improvement when no deadline is given
+UNPLACED_COST = 1000              # Objective cost of a course left without a room or time
+MOVED_COST = 10                   # Cost of giving a course another room or time
+SHIFT_COST_PER_HOUR = 1           # Extra cost per hour a course is moved later
+OPTIMIZER_EJECTION_LIMIT = 2      # Placed courses one move may push elsewhere
+OPTIMIZER_CHECK_INTERVAL = 256    # Iterations between deadline checks and progress reports
+OPTIMIZER_STALL_ITERATIONS = 5000  # Iterations without a new best before the search settles
+
+
+class ScheduleOptimizer:
+    """Simulated-annealing local search over (room, slot mask, shift) placements.
+
+    The objective is UNPLACED_COST per unplaced course, plus MOVED_COST per course that
+    leaves its original room or time, plus SHIFT_COST_PER_HOUR per hour of shift. It
+    starts from the first-fit placement (the greedy solver's), so stopping early never does
+    worse than greedy, and gives the courses that left out their cheapest free option,
+    most constrained first. Each step offers a displaced course a
+    cheaper option, moving up to OPTIMIZER_EJECTION_LIMIT blocking courses to their
+    cheapest free option. Worse steps are accepted with a probability that cools to zero
+    at the deadline. The best assignment seen is kept, so stopping at any time returns it;
+    the search ends at the deadline, at a zero cost, or after OPTIMIZER_STALL_ITERATIONS
+    iterations without a new best.
+    """
+
+    def __init__(self, courses, catalogue, deadline=None, progress=None, seed=0):
+        self.courses = courses
+        if deadline is None:
+            deadline = time.time() + OPTIMIZER_TIME_BUDGET
+        self.started = time.perf_counter()
+        self.deadline = self.started + (deadline - time.time())
+        self.progress = progress
+        self.rng = random.Random(seed)
+        self.iterations = 0
+        self.improvements = 0
+        self.placements = 0
+        self.last_improvement = 0
+        self.stopped = 'optimal'
+
+        self.columns = CourseColumns(courses, catalogue)
+        self.days = self.columns.day
+        self.teachers = self.columns.teacher
+        self.room_usage = defaultdict(dict)     # room id << 3 | day -> {course index: mask}
+        self.teacher_usage = defaultdict(dict)  # teacher id << 3 | day -> {course index: mask}
+        self.assignment = [None] * len(courses)
+        self.cost = UNPLACED_COST * len(courses)
+        self.displaced = set(range(len(courses)))  # Courses with a non-zero cost
+
+        # Seed: the first-fit placement, then the cheapest free option for the courses it left out.
+        # First fit needs no options, so it is in place before the deadline can cut the setup short.
+        _, assigned_rooms, _, _, _ = place_first_fit(self.columns)
+        for i, room in enumerate(assigned_rooms):
+            if room >= 0:
+                self._place(i, (room, slot_mask(self.columns.start[i], self.columns.end[i]), 0))
+        self.ready = self._build_options() and self._place_left_out(
+            [i for i, room in enumerate(assigned_rooms) if room < 0])
+        if not self.ready:
+            self.stopped = 'deadline'
+        self.best_cost = self.cost
+        self.best_assignment = list(self.assignment)
+
+    def _past_deadline(self, count):
+        return count % OPTIMIZER_CHECK_INTERVAL == 0 and time.perf_counter() >= self.deadline
+
+    def _build_options(self):
+        """Every course's options and their costs; False if the deadline passed first."""
+        self.options = []
+        self.option_costs = []
+        for i in range(len(self.courses)):
+            if self._past_deadline(i):
+                return False
+            options = self.columns.options(i)
+            self.options.append(options)
+            # Options are listed least disruptive first, so their costs never decrease along the list
+            self.option_costs.append(array('i', (self.option_cost(i, value) for value in options)))
+        return True
+
+    def _place_left_out(self, unplaced):
+        """Give each course first fit left out its cheapest free option; False if the deadline passed first."""
+        order = sorted(unplaced, key=lambda i: (len(self.options[i]), self.courses[i].start_minute))
+        for count, i in enumerate(order):
+            if self._past_deadline(count):
+                return False
+            value = next((value for value in self.options[i] if not self._blockers(i, value)), None)
+            if value is not None:
+                self._place(i, value)
+        return True
+
+    def option_cost(self, i, value):
+        if value is None:
+            return UNPLACED_COST
+        room, _, shift = value
+        if room == self.columns.room[i] and not shift:
+            return 0
+        return MOVED_COST + SHIFT_COST_PER_HOUR * shift // 60
+
+    def _blockers(self, i, value):
+        """Placed courses that clash with course i taking `value`, by room or by teacher."""
+        room, mask, _ = value
+        day = self.days[i]
+        blockers = set()
+        for usage in (self.room_usage.get(room << 3 | day), self.teacher_usage.get(self.teachers[i] << 3 | day)):
+            if usage:
+                blockers.update(j for j, busy in usage.items() if busy & mask and j != i)
+        return blockers
+
+    def _place(self, i, value):
+        room, mask, _ = value
+        day = self.days[i]
+        self.room_usage[room << 3 | day][i] = mask
+        self.teacher_usage[self.teachers[i] << 3 | day][i] = mask
+        self.assignment[i] = value
+        self.placements += 1
+        self._update_cost(i, UNPLACED_COST, self.option_cost(i, value))
+
+    def _remove(self, i):
+        room, _, _ = self.assignment[i]
+        day = self.days[i]
+        del self.room_usage[room << 3 | day][i]
+        del self.teacher_usage[self.teachers[i] << 3 | day][i]
+        self._update_cost(i, self.option_cost(i, self.assignment[i]), UNPLACED_COST)
+        self.assignment[i] = None
+
+    def _update_cost(self, i, old_cost, new_cost):
+        self.cost += new_cost - old_cost
+        if new_cost:
+            self.displaced.add(i)
+        else:
+            self.displaced.discard(i)
+
+    def _step(self, temperature):
+        """Try one move; returns True if it was kept."""
+        i = self.rng.choice(self._displaced_list)
+        current = self.assignment[i]
+        # The cheaper options are a prefix of the cost-ordered list
+        cheaper = bisect_left(self.option_costs[i], self.option_cost(i, current))
+        if not cheaper:
+            return False
+        value = self.options[i][self.rng.randrange(cheaper)]
+        blockers = self._blockers(i, value)
+        if len(blockers) > OPTIMIZER_EJECTION_LIMIT:
+            return False
+
+        before = self.cost
+        undo = [(j, self.assignment[j]) for j in (i, *blockers)]
+        for j in blockers:
+            self._remove(j)
+        if current is not None:
+            self._remove(i)
+        self._place(i, value)
+        for j in blockers:
+            moved_to = next((option for option in self.options[j] if not self._blockers(j, option)), None)
+            if moved_to is not None:
+                self._place(j, moved_to)
+
+        delta = self.cost - before
+        if delta <= 0 or (temperature > 0 and self.rng.random() < math.exp(-delta / temperature)):
+            return True
+        # Rejected: put every course touched back where it was
+        for j, _ in undo:
+            if self.assignment[j] is not None:
+                self._remove(j)
+        for j, old_value in undo:
+            if old_value is not None:
+                self._place(j, old_value)
+        return False
+
+    def run(self):
+        if not self.ready:
+            return  # The deadline passed during the setup; the seed placed so far stands
+        budget = max(self.deadline - self.started, 1e-9)
+        temperature = MOVED_COST
+        while self.displaced and self.best_cost > 0:
+            if self.iterations % OPTIMIZER_CHECK_INTERVAL == 0:
+                now = time.perf_counter()
+                if now >= self.deadline:
+                    self.stopped = 'deadline'
+                    return
+                if self.iterations - self.last_improvement >= OPTIMIZER_STALL_ITERATIONS:
+                    self.stopped = 'stalled'
+                    return
+                temperature = MOVED_COST * (1 - (now - self.started) / budget)
+                self._displaced_list = tuple(self.displaced)
+                if self.progress:
+                    self.progress(self.iterations, len(self.courses) - self.best_assignment.count(None))
+            self.iterations += 1
+            if self._step(temperature) and self.cost < self.best_cost:
+                self.best_cost = self.cost
+                self.best_assignment = list(self.assignment)
+                self.improvements += 1
+                self.last_improvement = self.iterations
+                self._displaced_list = tuple(self.displaced) or self._displaced_list
+
+    def result(self):
+        resolved_courses = []
+        unresolved_courses = []
+        moved = shift_minutes = 0
+        for i, course in enumerate(self.courses):
+            value = self.best_assignment[i]
+            details = course._asdict()
+            if value is None:
+                details['conflict'] = "No room or time slot left without displacing another course"
+                unresolved_courses.append(details)
+                continue
+            room, _, shift = value
+            details['room'] = self.columns.rooms[room]
+            details['moved'] = bool(self.option_cost(i, value))
+            if shift:
+                details['start_minute'] += shift
+                details['end_minute'] += shift
+                details['class_start_time'] = format_time(details['start_minute'])
+                details['class_end_time'] = format_time(details['end_minute'])
+            moved += details['moved']
+            shift_minutes += shift
+            resolved_courses.append(details)
+        return {
+            'resolved_courses': resolved_courses,
+            'unresolved_courses': unresolved_courses,
+            'timed_out': False,  # The deadline is this search's budget, the result is its best so far
+            'objective': {'value': self.best_cost, 'unplaced': len(unresolved_courses),
+                          'moved': moved, 'shift_minutes': shift_minutes, 'stopped': self.stopped},
+            'stats': {'iterations': self.iterations, 'improvements': self.improvements,
+                      'placement_attempts': self.placements},
+        }
+
+
+# Optimization mode: placements that disturb as few courses as possible within the deadline
+def resolve_conflicts_optimized(courses, deadline=None, progress=None, catalogue=None):
+    optimizer = ScheduleOptimizer(courses, catalogue or get_room_catalogue(), deadline=deadline, progress=progress)
+    optimizer.run()
+    return optimizer.result()
+
+
+# Solvers run by /resolve_conflicts and /compare_algorithms, each taking a course snapshot
+SOLVERS = {
+    'greedy': resolve_conflicts_greedy,
+    'backtracking': resolve_conflicts_backtracking,
+    'optimized': resolve_conflicts_optimized,
+}
     
     
    
+# Course listings are paged by (day_number, start_minute, id) keys rather than OFFSET, so a page
+# costs one index range seek however deep into the schedule it is
+COURSE_PAGE_ORDER = ('day_number', 'start_minute', 'id')
+MAX_PAGE_SIZE = 500
+COURSE_COUNT_CACHE_SIZE = 256     # Filtered listing totals remembered per schedule version
+
+course_count_cache = ExpiringLRUCache(COURSE_COUNT_CACHE_SIZE, app.config['SOLVER_CACHE_TTL'])
+
+
+def get_page_size():
+    """Page size from the `per_page` query argument, clamped to 1..MAX_PAGE_SIZE."""
+    try:
+        page_size = int(request.args.get('per_page', app.config['PAGE_SIZE']))
+    except ValueError:
+        page_size = app.config['PAGE_SIZE']
+    return max(1, min(page_size, MAX_PAGE_SIZE))
+
+
+def parse_page_key(token):
+    """Turn an 'day.start.id' page token back into a key tuple; None when absent or malformed."""
+    try:
+        key = tuple(int(part) for part in token.split('.'))
+    except (AttributeError, ValueError):
+        return None
+    return key if len(key) == len(COURSE_PAGE_ORDER) else None
+
+
+def format_page_key(row):
+    return '.'.join(str(row[column]) for column in COURSE_PAGE_ORDER)
+
+
+def fetch_course_page(conn, columns, conditions=(), params=(), after=None, before=None, page_size=None):
+    """Fetch one page of courses in schedule order after (or before) a page key.
+
+    Returns (rows, previous_key, next_key); a key is None when there is no page that way.
+    """
+    page_size = page_size or app.config['PAGE_SIZE']
+    order = ', '.join(COURSE_PAGE_ORDER)
+    conditions, params = list(conditions), list(params)
+    if before:
+        conditions.append(f"({order}) < (?, ?, ?)")
+        params.extend(before)
+        direction = 'DESC'
+    else:
+        if after:
+            conditions.append(f"({order}) > (?, ?, ?)")
+            params.extend(after)
+        direction = 'ASC'
+
+    query = "SELECT {} FROM course_schedule {} ORDER BY {} LIMIT ?".format(
+        '*' if '*' in columns else ', '.join(dict.fromkeys((*columns, *COURSE_PAGE_ORDER))),
+        f"WHERE {' AND '.join(conditions)}" if conditions else '',
+        ', '.join(f"{column} {direction}" for column in COURSE_PAGE_ORDER),
+    )
+    cursor = conn.cursor()
+    cursor.execute(query, (*params, page_size + 1))
+    rows = cursor.fetchall()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    if before:
+        rows.reverse()
+        previous_key = format_page_key(rows[0]) if has_more and rows else None
+        next_key = format_page_key(rows[-1]) if rows else None
+    else:
+        previous_key = format_page_key(rows[0]) if after and rows else None
+        next_key = format_page_key(rows[-1]) if has_more else None
+    return rows, previous_key, next_key
+
+
+def count_courses(conn, conditions=(), params=()):
+    """Number of courses matching the filters, without scanning the table on every page view.
+
+    The unfiltered total is a counter kept by triggers in schedule_meta; filtered totals are
+    counted once per schedule version and then served from course_count_cache.
+    """
+    cursor = conn.cursor()
+    if not conditions:
+        cursor.execute("SELECT value FROM schedule_meta WHERE key = 'course_count'")
+        row = cursor.fetchone()
+        if row is not None:
+            return row['value']
+
+    key = (tuple(conditions), tuple(params), get_schedule_version(conn))
+    total = course_count_cache.get(key)
+    if total is None:
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        cursor.execute(f"SELECT COUNT(*) FROM course_schedule {where}", tuple(params))
+        total = cursor.fetchone()[0]
+        course_count_cache.put(key, total)
+    return total
+
+
+def build_pagination(total, page_size, previous_key, next_key):
+    """Pagination context for _pagination.html; the links keep the current filters."""
+    args = {name: value for name, value in request.args.items() if name not in ('after', 'before')}
+    return {
+        'total': total,
+        'page_size': page_size,
+        'previous_url': url_for(request.endpoint, **args, before=previous_key) if previous_key else None,
+        'next_url': url_for(request.endpoint, **args, after=next_key) if next_key else None,
+    }
+
+
 @app.route('/', methods=['GET'])
 def index():
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM course_schedule")
-        courses = cursor.fetchall()
-        return render_template('base.html', courses=courses)
+    # The landing page lists nothing, so it no longer loads the schedule
+    return render_template('base.html')
+
+
+# Full-text search over course_search (FTS5, kept in sync with course_schedule by triggers);
+# bm25 weights for its teacher_name, course_code and course_title columns
+SEARCH_WEIGHTS = (4.0, 8.0, 1.0)
+MAX_SEARCH_OFFSET = 5000          # Deepest ranked search result a page may start at
+
+
+def build_search_query(text, column=None):
+    """Turn user input into an FTS5 query where every word is a quoted prefix; None if it has no words."""
+    words = re.findall(r'\w+', text)
+    if not words:
+        return None
+    query = ' AND '.join(f'"{word}"*' for word in words)
+    return f"{column} : ({query})" if column else f"({query})"
+
+
+def search_courses(conn, match, conditions=(), params=(), limit=None, offset=0):
+    """Best-ranked courses for an FTS5 query, narrowed by further conditions on course_schedule."""
+    where = ''.join(f" AND {condition}" for condition in conditions)
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT course_schedule.* FROM course_search
+        JOIN course_schedule ON course_schedule.id = course_search.rowid
+        WHERE course_search MATCH ?{where}
+        ORDER BY bm25(course_search, {', '.join(map(str, SEARCH_WEIGHTS))}), course_schedule.id
+        LIMIT ? OFFSET ?
+    """, (match, *params, limit or app.config['PAGE_SIZE'], offset))
+    return cursor.fetchall()
+
+
+def parse_search_offset(token):
+    """Turn a ranked-search page token (a result offset) back into an int; None when absent or malformed."""
+    try:
+        offset = int(token)
+    except (TypeError, ValueError):
+        return None
+    return offset if offset >= 0 else None
+
+
+def fetch_search_page(conn, match, conditions=(), params=(), after=None, before=None, page_size=None):
+    """Fetch one page of ranked search results after (or before) a result offset.
+
+    bm25 scores are no stable page key, so ranked pages use OFFSET, capped at
+    MAX_SEARCH_OFFSET so a deep page can't make every request skip most of the matches.
+    Returns (rows, previous_key, next_key) like fetch_course_page.
+    """
+    page_size = page_size or app.config['PAGE_SIZE']
+    before = parse_search_offset(before)
+    offset = max(0, before - page_size) if before is not None else parse_search_offset(after) or 0
+    offset = min(offset, MAX_SEARCH_OFFSET)
+
+    rows = search_courses(conn, match, conditions, params, limit=page_size + 1, offset=offset)
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    previous_key = str(offset) if offset else None
+    next_key = str(offset + page_size) if has_more and offset + page_size <= MAX_SEARCH_OFFSET else None
+    return rows, previous_key, next_key
+
+
+def find_courses(conn, search='', teacher_name='', course_code='', day_number=None, after=None, before=None, page_size=None):
+    """One page of the course list filters: (rows, previous_key, next_key, total).
+
+    Text filters are prefix matches on the full-text index; the day is an indexed equality.
+    Free text lists the best matches first, ranked by bm25 (see fetch_search_page); otherwise
+    courses come in schedule order. `after` and `before` are the page tokens of the request.
+    """
+    conditions = []
+    params = []
+    if day_number is not None:
+        conditions.append("day_number = ?")
+        params.append(day_number)
+
+    match = ' AND '.join(filter(None, [build_search_query(search),
+                                       build_search_query(teacher_name, 'teacher_name'),
+                                       build_search_query(course_code, 'course_code')]))
+    if match and search:
+        # Free-text search: the best matches first, ranked by bm25
+        courses, previous_key, next_key = fetch_search_page(
+            conn, match, conditions, params, after=after, before=before, page_size=page_size)
+    if match:
+        conditions.append("id IN (SELECT rowid FROM course_search WHERE course_search MATCH ?)")
+        params.append(match)
+    if not (match and search):
+        # Filtered listing: one page in schedule order
+        courses, previous_key, next_key = fetch_course_page(
+            conn, ('*',), conditions, params, after=parse_page_key(after), before=parse_page_key(before),
+            page_size=page_size)
+    return courses, previous_key, next_key, count_courses(conn, conditions, params)
 
 
 # Route to display the course schedule
@@ -439,30 +2250,24 @@ def index():
 def course_list():
     try:
         # Retrieve filter parameters from the request
+        search = request.args.get('q', '').strip()
         teacher_name = request.args.get('teacher_name', '').strip()
         course_code = request.args.get('course_code', '').strip()
         day_of_week = request.args.get('day_of_week', '').strip()
 
-        # Build the query dynamically based on filters
-        query = "SELECT * FROM course_schedule WHERE 1=1"
-        params = []
-
-        if teacher_name:
-            query += " AND teacher_name LIKE ?"
-            params.append(f"%{teacher_name}%")
-        if course_code:
-            query += " AND course_code LIKE ?"
-            params.append(f"%{course_code}%")
+        day_number = None
         if day_of_week:
-            query += " AND day_of_week LIKE ?"
-            params.append(f"%{day_of_week}%")
+            try:
+                day_number = parse_day(day_of_week)
+            except ValueError as e:
+                flash(str(e), "warning")
 
-        # Fetch the courses from the database based on the filter
+        page_size = get_page_size()
         with get_db_connection() as conn:
             if conn:
-                cursor = conn.cursor()
-                cursor.execute(query, tuple(params))
-                courses = cursor.fetchall()
+                courses, previous_key, next_key, total = find_courses(
+                    conn, search, teacher_name, course_code, day_number, after=request.args.get('after'),
+                    before=request.args.get('before'), page_size=page_size)
             else:
                 raise sqlite3.Error("Failed to connect to the database")
 
@@ -470,77 +2275,67 @@ def course_list():
         if not courses:
             flash("No courses found with the selected filters.", "info")
 
-        return render_template('index.html', courses=courses)
+        pagination = build_pagination(total, page_size, previous_key, next_key)
+        return render_template('index.html', courses=courses, pagination=pagination)
 
     except sqlite3.Error as e:
         flash(f"Error fetching course data: {e}", "danger")
         return render_template('index.html', courses=[])
 
 
+# Pages that can list a whole selection are streamed rather than rendered into one string
+STREAM_BUFFER_SIZE = 64           # Template output pieces gathered into each response chunk
+
+
+def stream_page(template_name, **context):
+    """Render a template as a streamed response, so the page goes out while rows are still read.
+
+    The request context (and with it the request's database connection) stays open until the
+    last chunk is sent. The session cookie goes out with the headers, so a streamed template
+    must not read flashed messages or otherwise change the session.
+    """
+    app.update_template_context(context)
+    stream = app.jinja_env.get_template(template_name).stream(context)
+    stream.enable_buffering(STREAM_BUFFER_SIZE)
+    return Response(stream_with_context(stream), mimetype='text/html')
+
+
 # Route For Course Selected
 @app.route('/course_schedule', methods=['GET', 'POST'])
 def course_schedule():
     try:
-        # Fetch selected course IDs from the session
-        selected_courses_ids = session.get('selected_courses', [])
-
-        # Check if any courses were selected
-        if not selected_courses_ids:
-            flash("No courses selected yet.", "info")
-            return render_template('course_schedule.html', grouped_courses_by_day={}, selected_courses=[], conflicts={})
+        # The session only carries a token; the selected ids are in course_selections
+        token = get_selection_token()
 
         # Connect to the database and get course details
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            query = "SELECT id, teacher_name, course_title, day_of_week, class_start_time, class_end_time, room FROM course_schedule WHERE id IN ({})".format(
-                ','.join('?' for _ in selected_courses_ids)
-            )
-            cursor.execute(query, tuple(selected_courses_ids))
-            selected_courses = cursor.fetchall()
-
-        # Group courses by day for better organization
-        grouped_courses_by_day = {}
-        for course in selected_courses:
-            day = course[3]  # 'day_of_week'
-            if day not in grouped_courses_by_day:
-                grouped_courses_by_day[day] = []
-            grouped_courses_by_day[day].append(course)
-
-        # Initialize an empty dict to store conflicts
-        conflicts = {}
-
-        # Check for conflicts
-        for day, courses in grouped_courses_by_day.items():
-            day_conflicts = []
-            for i, course in enumerate(courses):
-                for j, other_course in enumerate(courses):
-                    if i >= j:
-                        continue
-                    # Check for time and room conflicts
-                    if (course[4] < other_course[5] and course[5] > other_course[4]):  # Time overlap
-                        if course[6] == other_course[6]:  # Room conflict only if they are in the same room
-                            conflict_details = {
-                                'course_name': course[2],
-                                'teacher_name': course[1],
-                                'conflicting_course_name': other_course[2],
-                                'conflicting_teacher_name': other_course[1],
-                                'conflicting_start_time': other_course[4],
-                                'conflicting_end_time': other_course[5],
-                                'conflicting_room': other_course[6],
-                            }
-                            day_conflicts.append(conflict_details)
-            if day_conflicts:
-                conflicts[day] = day_conflicts
-
-        return render_template('course_schedule.html', grouped_courses_by_day=grouped_courses_by_day, selected_courses=selected_courses, conflicts=conflicts)
+            cursor.execute("""
+                SELECT id, teacher_name, course_title, day_of_week, class_start_time, class_end_time, room, start_minute, end_minute
+                FROM course_schedule WHERE id IN (SELECT course_id FROM course_selections WHERE token = ?)
+                ORDER BY day_number, start_minute, id
+            """, (token,))
+            first_course = cursor.fetchone()
+
+            # Check if any courses were selected
+            if first_course is None:
+                flash("No courses selected yet.", "info")
+                return render_template('course_schedule.html', courses_by_day=[], selected_courses=False, conflicts={})
+
+            # Conflicts are maintained as courses change, so this is a lookup rather than a pairwise scan
+            conflicts = fetch_selection_conflicts(conn, token)
+
+        # Rows arrive in day order, so the template can group them while the cursor is read
+        courses_by_day = itertools.groupby(itertools.chain([first_course], cursor), key=lambda course: course['day_of_week'])
+        return stream_page('course_schedule.html', courses_by_day=courses_by_day, selected_courses=True, conflicts=conflicts)
 
     except sqlite3.Error as e:
         flash(f"Error fetching selected courses: {e}", "danger")
-        return render_template('course_schedule.html', grouped_courses_by_day={}, selected_courses=[], conflicts={})
+        return render_template('course_schedule.html', courses_by_day=[], selected_courses=False, conflicts={})
 
     except Exception as e:
         flash(f"An unexpected error occurred: {e}", "danger")
-        return render_template('course_schedule.html', grouped_courses_by_day={}, selected_courses=[], conflicts={})
+        return render_template('course_schedule.html', courses_by_day=[], selected_courses=False, conflicts={})
 
 
 
@@ -548,42 +2343,42 @@ def course_schedule():
 @app.route('/select_courses', methods=['GET', 'POST'])
 def select_courses():
     try:
-        # Fetch all available courses with teacher information
+        # Fetch one page of available courses with teacher information
+        page_size = get_page_size()
         with get_db_connection() as conn:
             if conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT id, teacher_name, course_code , course_title, day_of_week, class_start_time, class_end_time
-                    FROM course_schedule
-                """)
-                courses = cursor.fetchall()
-            else:
-                raise sqlite3.Error("Failed to connect to the database")
-
-        # Get the list of selected courses from the session, defaulting to an empty list if none
-        selected_courses = session.get('selected_courses', [])
+                courses, previous_key, next_key = fetch_course_page(
+                    conn, ('id', 'teacher_name', 'course_code', 'course_title', 'day_of_week', 'class_start_time', 'class_end_time'),
+                    after=parse_page_key(request.args.get('after')), before=parse_page_key(request.args.get('before')),
+                    page_size=page_size)
+                total = count_courses(conn)
 
-        if request.method == 'POST':
-            # Get the list of selected courses from the form (checkboxes)
-            selected_courses = request.form.getlist('courses')
+                if request.method == 'POST':
+                    # The form only holds the checkboxes of one page: keep the selections made on other pages
+                    selected_count = update_selection(conn, add_ids=request.form.getlist('courses'),
+                                                      remove_ids=request.form.getlist('page_courses'))
+                    conn.commit()
 
-            # Ensure the user selects no more than 6 courses
-            if len(selected_courses) > 6:
-                flash("You can only select up to 6 courses.", "warning")
-                return redirect(url_for('select_courses'))  # Redirect back to the same page
+                    # A pager button posts to the page it leads to: show that page once the changes are saved
+                    if request.form.get('turn_page'):
+                        return redirect(url_for('select_courses', **request.args))
 
-            if len(selected_courses) == 0:
-                flash("Please select at least one course.", "warning")
-                return redirect(url_for('select_courses'))
+                    if selected_count == 0:
+                        flash("Please select at least one course.", "warning")
+                        return redirect(url_for('select_courses'))
 
-            # Store the selected courses in the session for persistence
-            session['selected_courses'] = selected_courses
+                    flash(f"{selected_count} course(s) selected!", "success")
+                    return redirect(url_for('course_schedule'))  # Redirect to the course schedule page
 
-            flash("Courses successfully selected!", "success")
-            return redirect(url_for('course_schedule'))  # Redirect to the course schedule page
+                # Mark the courses on this page that are already selected
+                selected_courses = set(map(str, load_selection(conn, among=[course['id'] for course in courses])))
+            else:
+                raise sqlite3.Error("Failed to connect to the database")
 
         # Pass the selected_courses to the template
-        return render_template('select_courses.html', courses=courses, selected_courses=selected_courses)
+        pagination = build_pagination(total, page_size, previous_key, next_key)
+        return render_template('select_courses.html', courses=courses, selected_courses=selected_courses,
+                               pagination=pagination)
 
     except sqlite3.Error as e:
         flash(f"Database error: {e}", "danger")
@@ -604,43 +2399,49 @@ def add_course():
             class_start_time = request.form['class_start_time'].strip()
             class_end_time = request.form['class_end_time'].strip()
             room = request.form['room'].strip()
+            enrollment = request.form.get('enrollment', '').strip() or '0'
+            required_features = ', '.join(sorted(parse_features(request.form.get('required_features', ''))))
 
             # Validate form fields
             if not all([teacher_name, course_code, course_title, day_of_week, class_start_time, class_end_time, room]):
                 flash("All fields are required.", "warning")
                 return render_template('add_course.html')
 
-            # Validate start time and end time
-            time_validation_message = validate_times(class_start_time, class_end_time)
-            if time_validation_message:
-                flash(time_validation_message, "warning")
+            if not enrollment.isdigit():
+                flash("Enrollment must be a whole number.", "warning")
+                return render_template('add_course.html')
+
+            # Validate day, start time and end time
+            validation_message = validate_day(day_of_week) or validate_times(class_start_time, class_end_time)
+            if validation_message:
+                flash(validation_message, "warning")
                 return render_template('add_course.html')
 
+            # Store the day and times in their canonical form alongside the integer columns
+            day_number = parse_day(day_of_week)
+            start_minute, end_minute = parse_time(class_start_time), parse_time(class_end_time)
+            day_of_week = DAY_NAMES[day_number - 1]
+            class_start_time, class_end_time = format_time(start_minute), format_time(end_minute)
+
             # Check for scheduling conflicts
             with get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(""" 
-                    SELECT * FROM course_schedule 
-                    WHERE (teacher_name = ? AND day_of_week = ? AND 
-                        ((class_start_time < ? AND class_end_time > ?) OR 
-                         (class_start_time < ? AND class_end_time > ?)))
-                    OR (room = ? AND day_of_week = ? AND
-                        ((class_start_time < ? AND class_end_time > ?) OR 
-                         (class_start_time < ? AND class_end_time > ?)))
-                """, (teacher_name, day_of_week, class_start_time, class_start_time, class_end_time, class_end_time,
-                      room, day_of_week, class_start_time, class_start_time, class_end_time, class_end_time))
-                existing_courses = cursor.fetchall()
+                existing_courses = check_schedule_conflict(conn, teacher_name, day_number, start_minute, end_minute, room)
 
                 if existing_courses:
                     flash("Course conflicts with an existing course.", "danger")
                     return render_template('add_course.html')
 
                 # Insert new course
+                cursor = conn.cursor()
                 cursor.execute(""" 
                     INSERT INTO course_schedule 
-                    (teacher_name, course_code, course_title, day_of_week, class_start_time, class_end_time, room)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (teacher_name, course_code, course_title, day_of_week, class_start_time, class_end_time, room))
+                    (teacher_name, course_code, course_title, day_of_week, class_start_time, class_end_time, room,
+                     enrollment, required_features, day_number, start_minute, end_minute)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (teacher_name, course_code, course_title, day_of_week, class_start_time, class_end_time, room,
+                      int(enrollment), required_features, day_number, start_minute, end_minute))
+                record_course_conflicts(conn, cursor.lastrowid)
+                refresh_busy_slots(conn, [(day_number, room, teacher_name)])
                 conn.commit()
                 flash("Course added successfully!", "success")
                 return redirect(url_for('index'))  # Redirect to the home page
@@ -672,13 +2473,40 @@ def edit_course(id):
                     class_start_time = request.form['class_start_time']
                     class_end_time = request.form['class_end_time']
                     room = request.form['room']
+                    enrollment = request.form.get('enrollment', '').strip() or '0'
+                    required_features = ', '.join(sorted(parse_features(request.form.get('required_features', ''))))
+
+                    if not enrollment.isdigit():
+                        flash("Enrollment must be a whole number.", "warning")
+                        return render_template('edit_course.html', course=course)
+
+                    validation_message = validate_day(day_of_week) or validate_times(class_start_time, class_end_time)
+                    if validation_message:
+                        flash(validation_message, "warning")
+                        return render_template('edit_course.html', course=course)
+
+                    day_number = parse_day(day_of_week)
+                    start_minute, end_minute = parse_time(class_start_time), parse_time(class_end_time)
+
+                    # Check for scheduling conflicts with every course but the one being edited
+                    if check_schedule_conflict(conn, teacher_name, day_number, start_minute, end_minute, room, exclude_id=id):
+                        flash("Course conflicts with an existing course.", "danger")
+                        return render_template('edit_course.html', course=course)
 
                     cursor.execute("""
                         UPDATE course_schedule
                         SET teacher_name = ?, course_code = ?, course_title = ?, 
-                            day_of_week = ?, class_start_time = ?, class_end_time = ?, room = ?
-                        WHERE id = ?""", (teacher_name, course_code, course_title, day_of_week,
-                                          class_start_time, class_end_time, room, id))
+                            day_of_week = ?, class_start_time = ?, class_end_time = ?, room = ?,
+                            enrollment = ?, required_features = ?,
+                            day_number = ?, start_minute = ?, end_minute = ?
+                        WHERE id = ?""", (teacher_name, course_code, course_title, DAY_NAMES[day_number - 1],
+                                          format_time(start_minute), format_time(end_minute), room,
+                                          int(enrollment), required_features,
+                                          day_number, start_minute, end_minute, id))
+                    # Drops the pairs recorded for the course's old slot
+                    record_course_conflicts(conn, id)
+                    refresh_busy_slots(conn, [(course['day_number'], course['room'], course['teacher_name']),
+                                              (day_number, room, teacher_name)])
                     conn.commit()
 
                     flash("Course updated successfully.", "success")
@@ -700,7 +2528,13 @@ def delete_course(id):
         with get_db_connection() as conn:
             if conn:
                 cursor = conn.cursor()
+                cursor.execute("SELECT day_number, room, teacher_name FROM course_schedule WHERE id = ?", (id,))
+                booking = cursor.fetchone()
                 cursor.execute("DELETE FROM course_schedule WHERE id = ?", (id,))
+                cursor.execute("DELETE FROM course_conflicts WHERE course_id = ? OR other_id = ?", (id, id))
+                cursor.execute("DELETE FROM course_selections WHERE course_id = ?", (id,))
+                if booking:
+                    refresh_busy_slots(conn, [tuple(booking)])
                 conn.commit()
 
                 flash("Course deleted successfully.", "success")
@@ -710,7 +2544,360 @@ def delete_course(id):
         flash(f"Error deleting course: {e}", "danger")
         return redirect(url_for('course_list'))
 
-    
+
+def parse_free_room_query(args):
+    """(day_number, start_minute, end_minute, enrollment, features, teacher_name) from a free-room query.
+
+    Raises ValueError with a message for the user when the day, times or enrollment are invalid.
+    """
+    day_of_week = args.get('day_of_week', '').strip()
+    class_start_time = args.get('class_start_time', '').strip()
+    class_end_time = args.get('class_end_time', '').strip()
+    enrollment = args.get('enrollment', '').strip() or '0'
+    validation_message = validate_day(day_of_week) or validate_times(class_start_time, class_end_time)
+    if validation_message:
+        raise ValueError(validation_message)
+    if not enrollment.isdigit():
+        raise ValueError("Enrollment must be a whole number.")
+    return (parse_day(day_of_week), parse_time(class_start_time), parse_time(class_end_time), int(enrollment),
+            parse_features(args.get('required_features', '')), args.get('teacher_name', '').strip())
+
+
+# Route to find rooms that are free at a given time
+@app.route('/free_rooms', methods=['GET'])
+def free_rooms():
+    if not request.args.get('day_of_week'):
+        return render_template('free_rooms.html', rooms=None)
+    try:
+        day_number, start_minute, end_minute, enrollment, features, teacher_name = parse_free_room_query(request.args)
+    except ValueError as e:
+        flash(str(e), "warning")
+        return render_template('free_rooms.html', rooms=None)
+
+    try:
+        with get_db_connection() as conn:
+            rooms = find_free_rooms(conn, day_number, start_minute, end_minute, enrollment, features)
+            teacher_free = teacher_is_free(conn, teacher_name, day_number, start_minute, end_minute) if teacher_name else None
+    except sqlite3.Error as e:
+        flash(f"Error looking up free rooms: {e}", "danger")
+        return render_template('free_rooms.html', rooms=None)
+
+    if not rooms:
+        flash("No room fits this course at that time.", "info")
+    return render_template('free_rooms.html', rooms=rooms, teacher_free=teacher_free)
+
+
+# JSON API (v1) for display boards and apps. Responses carry an ETag built from the schedule
+# version (and the selection's last change), so a poll with If-None-Match costs one lookup
+def get_selection_stamp(conn):
+    """When this session's selection last changed; 0 when it has none."""
+    token = get_selection_token()
+    row = conn.execute("SELECT updated_at FROM selections WHERE token = ?", (token,)).fetchone() if token else None
+    return row['updated_at'] if row else 0
+
+
+def conditional_json(etag, build, private=False):
+    """JSON response tagged with `etag`, or 304 Not Modified when the client already holds it.
+
+    `build` is only called for a stale or missing copy. A timed-out result is sent untagged,
+    since asking again may produce a better one. A `private` response depends on the session
+    cookie, so shared caches must not keep it.
+    """
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        timed_out = False
+    else:
+        data = build()
+        response = jsonify(data)
+        timed_out = data.get('timed_out')
+    if not timed_out:
+        response.set_etag(etag)
+    if private:
+        response.headers['Cache-Control'] = 'private, no-cache'
+        response.vary.add('Cookie')
+    else:
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+@app.route('/api/v1/courses', methods=['GET'])
+def api_courses():
+    """Courses matching the course list filters (q, teacher_name, course_code, day_of_week), one page at a time."""
+    day_of_week = request.args.get('day_of_week', '').strip()
+    try:
+        day_number = parse_day(day_of_week) if day_of_week else None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        with get_db_connection() as conn:
+            version = get_schedule_version(conn)
+
+            def build():
+                page_size = get_page_size()
+                courses, previous_key, next_key, total = find_courses(
+                    conn, request.args.get('q', '').strip(), request.args.get('teacher_name', '').strip(),
+                    request.args.get('course_code', '').strip(), day_number,
+                    after=request.args.get('after'), before=request.args.get('before'), page_size=page_size)
+                return {
+                    'schedule_version': version,
+                    'courses': [dict(course) for course in courses],
+                    'pagination': build_pagination(total, page_size, previous_key, next_key),
+                }
+
+            return conditional_json(f"courses-{version}", build)
+    except sqlite3.Error as e:
+        return jsonify({'error': f"Error fetching course data: {e}"}), 500
+
+
+@app.route('/api/v1/selection/conflicts', methods=['GET'])
+def api_selection_conflicts():
+    """Stored room and teacher conflicts among this session's selected courses, grouped by day."""
+    try:
+        with get_db_connection() as conn:
+            version = get_schedule_version(conn)
+
+            def build():
+                token = get_selection_token()
+                return {
+                    'schedule_version': version,
+                    'course_ids': load_selection(conn),
+                    'conflicts': fetch_selection_conflicts(conn, token) if token else {},
+                }
+
+            return conditional_json(f"conflicts-{version}-{get_selection_stamp(conn)}", build, private=True)
+    except sqlite3.Error as e:
+        return jsonify({'error': f"Error fetching selected courses: {e}"}), 500
+
+
+@app.route('/api/v1/selection/solution', methods=['GET'])
+def api_selection_solution():
+    """Every solver's result for this session's selection; solved (or taken from the solver cache) only when stale."""
+    try:
+        with get_db_connection() as conn:
+            version = get_schedule_version(conn)
+            selected_courses_ids = load_selection(conn)
+            if not selected_courses_ids:
+                return jsonify({'error': "No courses selected yet."}), 404
+
+            def build():
+                solver_results = solve_selection(conn, selected_courses_ids)
+                return {
+                    'schedule_version': version,
+                    'course_ids': selected_courses_ids,
+                    'timed_out': any(result.get('timed_out') for result, _ in solver_results.values()),
+                    'solvers': {name: {'result': result, 'execution_time': seconds}
+                                for name, (result, seconds) in solver_results.items()},
+                }
+
+            return conditional_json(f"solution-{version}-{get_selection_stamp(conn)}", build, private=True)
+    except sqlite3.Error as e:
+        return jsonify({'error': f"Error fetching selected courses: {e}"}), 500
+
+
+@app.route('/api/v1/free_rooms', methods=['GET'])
+def api_free_rooms():
+    """Rooms free for the whole of a time slot (day_of_week, class_start_time, class_end_time), smallest first."""
+    try:
+        day_number, start_minute, end_minute, enrollment, features, teacher_name = parse_free_room_query(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        with get_db_connection() as conn:
+            version = get_schedule_version(conn)
+
+            def build():
+                data = {'schedule_version': version,
+                        'rooms': find_free_rooms(conn, day_number, start_minute, end_minute, enrollment, features)}
+                if teacher_name:
+                    data['teacher_free'] = teacher_is_free(conn, teacher_name, day_number, start_minute, end_minute)
+                return data
+
+            return conditional_json(f"free-rooms-{version}", build)
+    except sqlite3.Error as e:
+        return jsonify({'error': f"Error looking up free rooms: {e}"}), 500
+
+
+# Bulk import: columns accepted in an uploaded CSV or JSON file
+IMPORT_REQUIRED_FIELDS = ('teacher_name', 'course_code', 'course_title', 'day_of_week',
+                          'class_start_time', 'class_end_time', 'room')
+
+
+def read_import_rows(stream, filename):
+    """Yield (line number, row dict) per course from a binary CSV, JSON array or JSON Lines stream.
+
+    CSV and JSON Lines are read as they stream in, and rows are numbered by their line in the
+    file (a CSV row by the line it ends on, the header being line 1). A JSON array is parsed
+    whole, so large imports should use one of the other formats; its rows are numbered by
+    their position in the array.
+    """
+    if filename.lower().endswith('.jsonl'):
+        for line_number, line in enumerate(io.TextIOWrapper(stream, encoding='utf-8-sig'), start=1):
+            if line.strip():
+                yield line_number, json.loads(line)
+    elif filename.lower().endswith('.json'):
+        yield from enumerate(json.load(stream), start=1)
+    else:
+        reader = csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+        for row in reader:
+            yield reader.line_num, row
+
+
+def parse_import_row(row):
+    """Normalise one imported row into an INSERT tuple, raising ValueError with a readable reason."""
+    values = {field: str(row.get(field) or '').strip() for field in IMPORT_REQUIRED_FIELDS}
+    missing = [field for field, value in values.items() if not value]
+    if missing:
+        raise ValueError(f"Missing {', '.join(missing)}.")
+
+    validation_message = validate_day(values['day_of_week']) or validate_times(values['class_start_time'], values['class_end_time'])
+    if validation_message:
+        raise ValueError(validation_message)
+    if not values['room'].isdigit():
+        raise ValueError("Room must be a room number.")
+    enrollment = str(row.get('enrollment') or '0').strip()
+    if not enrollment.isdigit():
+        raise ValueError("Enrollment must be a whole number.")
+
+    day_number = parse_day(values['day_of_week'])
+    start_minute, end_minute = parse_time(values['class_start_time']), parse_time(values['class_end_time'])
+    return (values['teacher_name'], values['course_code'], values['course_title'], DAY_NAMES[day_number - 1],
+            format_time(start_minute), format_time(end_minute), int(values['room']), int(enrollment),
+            ', '.join(sorted(parse_features(row.get('required_features')))), day_number, start_minute, end_minute)
+
+
+def import_courses(conn, rows):
+    """Insert a batch of courses in one transaction, skipping rows that are invalid or conflict.
+
+    Existing bookings for the batch's days are loaded once into a ScheduleIndex; the batch is
+    then swept in (day, start) order, so conflicts with existing courses and with earlier rows
+    of the same file are both caught with O(log n) probes. `rows` are the (line number, row)
+    pairs of read_import_rows.
+    Returns (imported_count, report) where report lists every row that was not imported.
+    """
+    report = []
+    parsed_rows = []
+    for line_number, row in rows:
+        try:
+            parsed_rows.append((line_number, parse_import_row(row)))
+        except (ValueError, AttributeError) as e:
+            report.append({'line': line_number, 'course_code': row.get('course_code', '') if isinstance(row, dict) else '',
+                           'status': 'invalid', 'message': str(e)})
+
+    cursor = conn.cursor()
+    schedule_index = ScheduleIndex()
+    days = sorted({parsed[9] for _, parsed in parsed_rows})
+    if days:
+        cursor.execute("""
+            SELECT day_number, room, teacher_name, start_minute, end_minute FROM course_schedule
+            WHERE day_number IN ({})
+        """.format(','.join('?' for _ in days)), days)
+        for day_number, room, teacher_name, start_minute, end_minute in cursor:
+            schedule_index.book(day_number, room, teacher_name, start_minute, end_minute)
+
+    accepted = []
+    parsed_rows.sort(key=lambda item: (item[1][9], item[1][10]))
+    for line_number, parsed in parsed_rows:
+        teacher_name, course_code, room = parsed[0], parsed[1], parsed[6]
+        day_number, start_minute, end_minute = parsed[9:12]
+        if not schedule_index.teacher_is_free(day_number, teacher_name, start_minute, end_minute):
+            message = f"{teacher_name} is already teaching at this time."
+        elif not schedule_index.room_is_free(day_number, room, start_minute, end_minute):
+            message = f"Room {room} is already booked at this time."
+        else:
+            schedule_index.book(day_number, room, teacher_name, start_minute, end_minute)
+            accepted.append(parsed)
+            continue
+        report.append({'line': line_number, 'course_code': course_code, 'status': 'conflict', 'message': message})
+
+    with conn:
+        cursor.executemany("""
+            INSERT INTO course_schedule
+            (teacher_name, course_code, course_title, day_of_week, class_start_time, class_end_time, room,
+             enrollment, required_features, day_number, start_minute, end_minute)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, accepted)
+        refresh_busy_slots(conn, [(parsed[9], parsed[6], parsed[0]) for parsed in accepted])
+
+    report.sort(key=lambda entry: entry['line'])
+    return len(accepted), report
+
+
+# Route to import many courses at once
+@app.route('/import', methods=['GET', 'POST'])
+def import_courses_upload():
+    if request.method == 'POST':
+        upload = request.files.get('course_file')
+        if not upload or not upload.filename:
+            flash("Please choose a CSV or JSON file to import.", "warning")
+            return render_template('import_courses.html', report=None)
+
+        try:
+            with get_db_connection() as conn:
+                imported, report = import_courses(conn, read_import_rows(upload.stream, upload.filename))
+        except (ValueError, csv.Error) as e:
+            flash(f"Could not read {upload.filename}: {e}", "danger")
+            return render_template('import_courses.html', report=None)
+        except sqlite3.Error as e:
+            flash(f"Error importing courses: {e}", "danger")
+            return render_template('import_courses.html', report=None)
+
+        flash(f"Imported {imported} course(s); {len(report)} row(s) skipped.", "success" if not report else "warning")
+        return render_template('import_courses.html', report=report, imported=imported)
+
+    return render_template('import_courses.html', report=None)
+
+
+@app.cli.command('import-courses')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+def import_courses_command(path):
+    """Import courses from a CSV, JSON or JSON Lines file."""
+    with open(path, 'rb') as stream, get_db_connection() as conn:
+        imported, report = import_courses(conn, read_import_rows(stream, path))
+    for entry in report:
+        click.echo(f"line {entry['line']} ({entry['course_code']}): {entry['status']} - {entry['message']}")
+    click.echo(f"Imported {imported} course(s); {len(report)} row(s) skipped.")
+
+
+
+@app.cli.command('rebuild-conflicts')
+def rebuild_conflicts_command():
+    """Recompute the course_conflicts table from the whole schedule, one day at a time."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM course_conflicts")
+        counts = {'room': 0, 'teacher': 0}
+        for day_number in range(1, len(DAY_NAMES) + 1):
+            cursor.execute("""
+                SELECT id, teacher_name, room, day_number, start_minute, end_minute
+                FROM course_schedule WHERE day_number = ?
+            """, (day_number,))
+            conflicts = list(detect_conflicts(cursor.fetchall()))
+            cursor.executemany("INSERT INTO course_conflicts (course_id, other_id, kind) VALUES (?, ?, ?)", conflicts)
+            for _, _, kind in conflicts:
+                counts[kind] += 1
+    click.echo(f"Recorded {counts['room']} room conflict(s) and {counts['teacher']} teacher conflict(s).")
+
+
+@app.cli.command('rebuild-free-slots')
+def rebuild_free_slots_command():
+    """Recompute the room and teacher busy-slot maps from the whole schedule."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        masks = {table: {} for table, _ in BUSY_SLOT_TABLES}
+        cursor.execute("SELECT day_number, room, teacher_name, start_minute, end_minute FROM course_schedule")
+        for day_number, room, teacher_name, start_minute, end_minute in cursor.fetchall():
+            mask = slot_mask(start_minute, end_minute)
+            for (table, _), value in zip(BUSY_SLOT_TABLES, (room, teacher_name)):
+                masks[table][day_number, value] = masks[table].get((day_number, value), 0) | mask
+        for table, column in BUSY_SLOT_TABLES:
+            cursor.execute(f"DELETE FROM {table}")
+            cursor.executemany(f"INSERT INTO {table} (day_number, {column}, busy) VALUES (?, ?, ?)",
+                               [(day_number, value, encode_slot_mask(mask)) for (day_number, value), mask in masks[table].items()])
+    click.echo(f"Recorded {len(masks['room_busy_slots'])} room day(s) and {len(masks['teacher_busy_slots'])} teacher day(s).")
+
+
 # Start the Flask application
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,165 @@
+"""Benchmark the conflict solvers on seeded synthetic schedules.
+
+    python benchmark.py --sizes 100 500 2000 --rooms 20 --teachers 60 --density 1.2 --output bench.json
+
+Every solver in app.SOLVERS runs on the same generated schedules. The JSON report has, per solver
+and size: latency percentiles, throughput, peak traced memory and placement quality. Progress
+goes to stderr, so without --output stdout carries nothing but the JSON report.
+"""
+import argparse
+import contextlib
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import app
+from app import Course, RoomCatalogue, SOLVERS, format_time, time_solver
+
+# Synthetic schedules: weekday courses starting on the hour or half hour from 8:00
+DAY_START = 8 * 60
+LATEST_END = 18 * 60
+COURSE_LENGTHS = (50, 60, 75, 90)
+ROOM_CAPACITIES = (30, 40, 60, 100, 200)
+ROOM_FEATURES = ('projector', 'lab')
+FEATURE_RATE = 0.1              # Share of courses that need a room feature
+
+
+def generate_schedule(course_count, room_count, teacher_count, density, seed):
+    """Build a reproducible schedule: (courses, rooms) with Course snapshots and catalogue rows.
+
+    `density` is the ratio of course-minutes to room-minutes inside the teaching window. The
+    window shrinks as the density grows, so 1.0 already means a full window and anything
+    above it cannot all fit without moving courses later or to other days.
+    """
+    rng = random.Random(seed)
+    rooms = []
+    for room_id in range(1, room_count + 1):
+        features = frozenset(feature for feature in ROOM_FEATURES if rng.random() < 0.3)
+        rooms.append((room_id, f"Room {room_id}", rng.choice(ROOM_CAPACITIES), features))
+
+    days = len(app.DAY_NAMES) - 2  # Monday to Friday
+    mean_length = sum(COURSE_LENGTHS) / len(COURSE_LENGTHS)
+    window = course_count * mean_length / (density * room_count * days)
+    window = int(max(60, min(window, LATEST_END - DAY_START - max(COURSE_LENGTHS))))
+
+    courses = []
+    for course_id in range(1, course_count + 1):
+        day_number = rng.randint(1, days)
+        start_minute = DAY_START + rng.randrange(0, window + 1, 30)
+        end_minute = start_minute + rng.choice(COURSE_LENGTHS)
+        required = rng.choice(ROOM_FEATURES) if rng.random() < FEATURE_RATE else ''
+        courses.append(Course(
+            id=course_id,
+            teacher_name=f"Teacher {rng.randint(1, teacher_count)}",
+            course_title=f"Course {course_id}",
+            day_of_week=app.DAY_NAMES[day_number - 1],
+            class_start_time=format_time(start_minute),
+            class_end_time=format_time(end_minute),
+            room=rng.randint(1, room_count),
+            enrollment=rng.randint(10, 120),
+            required_features=required,
+            day_number=day_number,
+            start_minute=start_minute,
+            end_minute=end_minute,
+        ))
+    return tuple(courses), rooms
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, round(fraction * len(ordered)) - 1))]
+
+
+def placement_quality(courses, result):
+    """How much of the schedule a solver placed, and how many placed courses it had to move."""
+    originals = {course.id: (course.room, course.class_start_time) for course in courses}
+    resolved = result.get('resolved_courses', [])
+    moved = sum(1 for course in resolved
+                if (course['room'], course['class_start_time']) != originals.get(course['id']))
+    return len(resolved), moved
+
+
+def benchmark_solver(name, size, args):
+    """Run one solver `args.repeats` times on fresh schedules of one size and summarise the runs."""
+    latencies, placed, moved, timed_out = [], [], [], 0
+    peak_memory = 0
+    operations = {}
+    for repeat in range(args.repeats):
+        courses, rooms = generate_schedule(size, args.rooms, args.teachers, args.density, args.seed + repeat)
+        catalogue = RoomCatalogue(rooms)
+
+        result, seconds = time_solver(name, courses, time.time() + args.deadline, catalogue=catalogue)
+        latencies.append(seconds)
+        placed_count, moved_count = placement_quality(courses, result)
+        placed.append(placed_count / size)
+        moved.append(moved_count)
+        timed_out += bool(result.get('timed_out'))
+        for counter, value in result.get('stats', {}).items():
+            operations[counter] = operations.get(counter, 0) + value / args.repeats
+
+        # Memory is traced on a separate run so the tracing overhead stays out of the latencies
+        if repeat == 0:
+            tracemalloc.start()
+            time_solver(name, courses, time.time() + args.deadline, catalogue=catalogue)
+            peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    median = percentile(latencies, 0.5)
+    return {
+        'solver': name,
+        'courses': size,
+        'runs': args.repeats,
+        'latency_p50': median,
+        'latency_p99': percentile(latencies, 0.99),
+        'latency_max': max(latencies),
+        'throughput_courses_per_second': size / median if median else None,
+        'peak_memory_bytes': peak_memory,
+        'placed_ratio_mean': sum(placed) / len(placed),
+        'placed_ratio_min': min(placed),
+        'moved_courses_mean': sum(moved) / len(moved),
+        'timed_out_runs': timed_out,
+        'operations_mean': operations,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 200, 1000], help="course counts to sweep")
+    parser.add_argument('--rooms', type=int, default=20)
+    parser.add_argument('--teachers', type=int, default=60)
+    parser.add_argument('--density', type=float, default=1.0, help="course-minutes per room-minute in the window")
+    parser.add_argument('--repeats', type=int, default=5, help="schedules generated per size")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--deadline', type=float, default=app.app.config['SOLVER_DEADLINE'], help="seconds per run")
+    parser.add_argument('--solvers', nargs='+', choices=sorted(SOLVERS), default=list(SOLVERS))
+    parser.add_argument('--output', help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = []
+    # Anything the app prints while solving goes to stderr with the progress lines
+    with contextlib.redirect_stdout(sys.stderr):
+        for size in args.sizes:
+            for name in args.solvers:
+                results.append(benchmark_solver(name, size, args))
+                print(f"{name:>12} {size:>6} courses: p50 {results[-1]['latency_p50']:.4f}s, "
+                      f"placed {results[-1]['placed_ratio_mean']:.1%}")
+
+    report = {
+        'config': {name: value for name, value in vars(args).items() if name != 'output'},
+        'environment': {'python': platform.python_version(), 'platform': platform.platform()},
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
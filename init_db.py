@@ -1,9 +1,24 @@
+import os
 import sqlite3
+import sys
 
-# Connect to SQLite database (or create it if it doesn't exist)
-conn = sqlite3.connect('university_schedule.db')
+
+def add_column_if_missing(cursor, table, column, definition):
+    """Add a column to an existing table so older databases keep working."""
+    cursor.execute(f"PRAGMA table_info({table})")
+    if column not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+# Connect to SQLite database (or create it if it doesn't exist); the path can be passed as an
+# argument or through SCHEDULE_DATABASE, the same variable the app reads
+db_path = sys.argv[1] if len(sys.argv) > 1 else os.environ.get('SCHEDULE_DATABASE', 'university_schedule.db')
+conn = sqlite3.connect(db_path)
 cursor = conn.cursor()
 
+# Write-ahead logging lets readers and a writer work concurrently across app workers
+cursor.execute("PRAGMA journal_mode=WAL")
+
 # Create the `course_schedule` table
 cursor.execute('''
     CREATE TABLE IF NOT EXISTS course_schedule (
@@ -14,7 +29,221 @@ cursor.execute('''
         day_of_week TEXT NOT NULL,
         class_start_time TIME NOT NULL,
         class_end_time TIME NOT NULL,
-        room INTEGER NOT NULL
+        room INTEGER NOT NULL,
+        enrollment INTEGER NOT NULL DEFAULT 0,
+        required_features TEXT NOT NULL DEFAULT '',
+        day_number INTEGER NOT NULL,    -- 1 (Monday) .. 7 (Sunday)
+        start_minute INTEGER NOT NULL,  -- Minutes since midnight
+        end_minute INTEGER NOT NULL
+    )
+''')
+
+# Room requirements were added after the first release
+add_column_if_missing(cursor, 'course_schedule', 'enrollment', "INTEGER NOT NULL DEFAULT 0")
+add_column_if_missing(cursor, 'course_schedule', 'required_features', "TEXT NOT NULL DEFAULT ''")
+
+# Integer day and time columns were added later; backfill them from the text columns
+add_column_if_missing(cursor, 'course_schedule', 'day_number', "INTEGER")
+add_column_if_missing(cursor, 'course_schedule', 'start_minute', "INTEGER")
+add_column_if_missing(cursor, 'course_schedule', 'end_minute', "INTEGER")
+cursor.execute('''
+    UPDATE course_schedule SET
+        day_number = CASE substr(lower(trim(day_of_week)), 1, 3)
+            WHEN 'mon' THEN 1 WHEN 'tue' THEN 2 WHEN 'wed' THEN 3 WHEN 'thu' THEN 4
+            WHEN 'fri' THEN 5 WHEN 'sat' THEN 6 WHEN 'sun' THEN 7 END,
+        start_minute = CAST(substr(class_start_time, 1, instr(class_start_time, ':') - 1) AS INTEGER) * 60
+                     + CAST(substr(class_start_time, instr(class_start_time, ':') + 1, 2) AS INTEGER),
+        end_minute = CAST(substr(class_end_time, 1, instr(class_end_time, ':') - 1) AS INTEGER) * 60
+                   + CAST(substr(class_end_time, instr(class_end_time, ':') + 1, 2) AS INTEGER)
+    WHERE day_number IS NULL OR start_minute IS NULL OR end_minute IS NULL
+''')
+cursor.execute("SELECT COUNT(*) FROM course_schedule WHERE day_number IS NULL")
+unparsed_days = cursor.fetchone()[0]
+if unparsed_days:
+    print(f"Warning: {unparsed_days} course(s) have an unrecognised day_of_week; fix them before resolving conflicts.")
+
+# Composite indexes so room and teacher overlap lookups are range seeks
+cursor.execute("CREATE INDEX IF NOT EXISTS idx_course_room_slot ON course_schedule (day_number, room, start_minute)")
+cursor.execute("CREATE INDEX IF NOT EXISTS idx_course_teacher_slot ON course_schedule (day_number, teacher_name, start_minute)")
+
+# Listing order: pages are keyed on (day_number, start_minute, id), with id implied by the rowid
+cursor.execute("CREATE INDEX IF NOT EXISTS idx_course_day_start ON course_schedule (day_number, start_minute)")
+
+# Schedule version: bumped on every course change so cached solver results for the old schedule go stale
+cursor.execute('''
+    CREATE TABLE IF NOT EXISTS schedule_meta (
+        key TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    )
+''')
+cursor.execute("INSERT OR IGNORE INTO schedule_meta (key, value) VALUES ('schedule_version', 0)")
+
+# Course count for the listing pages, resynchronised here and then kept by triggers
+cursor.execute("INSERT OR REPLACE INTO schedule_meta (key, value) SELECT 'course_count', COUNT(*) FROM course_schedule")
+for event, change in (('INSERT', '+ 1'), ('DELETE', '- 1')):
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS count_courses_on_{event.lower()}
+        AFTER {event} ON course_schedule
+        BEGIN
+            UPDATE schedule_meta SET value = value {change} WHERE key = 'course_count';
+        END
+    ''')
+for event in ('INSERT', 'UPDATE', 'DELETE'):
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS bump_schedule_version_on_{event.lower()}
+        AFTER {event} ON course_schedule
+        BEGIN
+            UPDATE schedule_meta SET value = value + 1 WHERE key = 'schedule_version';
+        END
+    ''')
+
+# Full-text index over teacher, course code and title for the course list filters. It stores no
+# copy of the text (content='course_schedule'); triggers keep it in step with the table.
+cursor.execute('''
+    CREATE VIRTUAL TABLE IF NOT EXISTS course_search USING fts5(
+        teacher_name, course_code, course_title,
+        content='course_schedule', content_rowid='id', prefix='2 3'
+    )
+''')
+cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS course_search_on_insert AFTER INSERT ON course_schedule
+    BEGIN
+        INSERT INTO course_search (rowid, teacher_name, course_code, course_title)
+        VALUES (new.id, new.teacher_name, new.course_code, new.course_title);
+    END
+''')
+cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS course_search_on_delete AFTER DELETE ON course_schedule
+    BEGIN
+        INSERT INTO course_search (course_search, rowid, teacher_name, course_code, course_title)
+        VALUES ('delete', old.id, old.teacher_name, old.course_code, old.course_title);
+    END
+''')
+cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS course_search_on_update
+    AFTER UPDATE OF teacher_name, course_code, course_title ON course_schedule
+    BEGIN
+        INSERT INTO course_search (course_search, rowid, teacher_name, course_code, course_title)
+        VALUES ('delete', old.id, old.teacher_name, old.course_code, old.course_title);
+        INSERT INTO course_search (rowid, teacher_name, course_code, course_title)
+        VALUES (new.id, new.teacher_name, new.course_code, new.course_title);
+    END
+''')
+cursor.execute("INSERT INTO course_search (course_search) VALUES ('rebuild')")
+
+# Create the `course_conflicts` table: overlapping pairs (lower id first), kept current by the app
+cursor.execute('''
+    CREATE TABLE IF NOT EXISTS course_conflicts (
+        course_id INTEGER NOT NULL,
+        other_id INTEGER NOT NULL,
+        kind TEXT NOT NULL,             -- 'room' or 'teacher'
+        PRIMARY KEY (course_id, other_id, kind)
+    ) WITHOUT ROWID
+''')
+cursor.execute("CREATE INDEX IF NOT EXISTS idx_course_conflicts_other ON course_conflicts (other_id)")
+
+# Record the overlaps already in the schedule, dropping pairs that no longer overlap (like
+# `flask rebuild-conflicts`); each probe is a range seek on the slot indexes
+cursor.execute("DELETE FROM course_conflicts")
+for kind, column in (('room', 'room'), ('teacher', 'teacher_name')):
+    cursor.execute(f'''
+        INSERT OR IGNORE INTO course_conflicts (course_id, other_id, kind)
+        SELECT c.id, o.id, ? FROM course_schedule c
+        JOIN course_schedule o ON o.day_number = c.day_number AND o.{column} = c.{column}
+            AND o.start_minute < c.end_minute AND o.end_minute > c.start_minute AND o.id > c.id
+    ''', (kind,))
+
+# Busy-slot maps: a bitmask of 5-minute slots (SLOT_MINUTES in app.py) per (day, room) and per
+# (day, teacher), stored as a little-endian BLOB. The app refreshes the keys a course change touches;
+# here they are rebuilt from the whole schedule.
+SLOT_MINUTES = 5
+for table, column, column_type in (('room_busy_slots', 'room', 'INTEGER'), ('teacher_busy_slots', 'teacher_name', 'TEXT')):
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {table} (
+            day_number INTEGER NOT NULL,
+            {column} {column_type} NOT NULL,
+            busy BLOB NOT NULL,
+            PRIMARY KEY (day_number, {column})
+        ) WITHOUT ROWID
+    ''')
+    masks = {}
+    cursor.execute(f"SELECT day_number, {column}, start_minute, end_minute FROM course_schedule")
+    for day_number, value, start_minute, end_minute in cursor.fetchall():
+        first_slot, last_slot = start_minute // SLOT_MINUTES, -(-end_minute // SLOT_MINUTES)
+        mask = ((1 << (last_slot - first_slot)) - 1) << first_slot
+        masks[day_number, value] = masks.get((day_number, value), 0) | mask
+    cursor.execute(f"DELETE FROM {table}")
+    cursor.executemany(f"INSERT INTO {table} (day_number, {column}, busy) VALUES (?, ?, ?)",
+                       [(day_number, value, mask.to_bytes(24 * 60 // SLOT_MINUTES // 8, 'little'))
+                        for (day_number, value), mask in masks.items()])
+
+# Create the `rooms` table; `course_schedule.room` refers to `rooms.id`
+cursor.execute('''
+    CREATE TABLE IF NOT EXISTS rooms (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        capacity INTEGER NOT NULL DEFAULT 0,
+        features TEXT NOT NULL DEFAULT ''
+    )
+''')
+cursor.execute("CREATE INDEX IF NOT EXISTS idx_rooms_capacity ON rooms (capacity)")
+
+# Seed the five default rooms plus any room already used by a course
+cursor.execute("SELECT COUNT(*) FROM rooms")
+if cursor.fetchone()[0] == 0:
+    cursor.executemany("INSERT INTO rooms (id, name, capacity) VALUES (?, ?, ?)",
+                       [(room, f"Room {room}", 40) for room in range(1, 6)])
+    cursor.execute('''
+        INSERT OR IGNORE INTO rooms (id, name, capacity)
+        SELECT DISTINCT CAST(room AS INTEGER), 'Room ' || room, 40 FROM course_schedule
+        WHERE CAST(room AS INTEGER) > 0
+    ''')
+
+# Rooms version: bumped on every room change so the app reloads its room catalogue. Free rooms
+# and solver results depend on the rooms too, so the schedule version moves with it.
+cursor.execute("INSERT OR IGNORE INTO schedule_meta (key, value) VALUES ('rooms_version', 0)")
+for event in ('INSERT', 'UPDATE', 'DELETE'):
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS bump_rooms_version_on_{event.lower()}
+        AFTER {event} ON rooms
+        BEGIN
+            UPDATE schedule_meta SET value = value + 1 WHERE key IN ('rooms_version', 'schedule_version');
+        END
+    ''')
+
+# Course selections: the session cookie holds only the token
+cursor.execute('''
+    CREATE TABLE IF NOT EXISTS selections (
+        token TEXT PRIMARY KEY,
+        updated_at REAL NOT NULL
+    )
+''')
+cursor.execute("CREATE INDEX IF NOT EXISTS idx_selections_updated ON selections (updated_at)")
+cursor.execute('''
+    CREATE TABLE IF NOT EXISTS course_selections (
+        token TEXT NOT NULL,
+        course_id INTEGER NOT NULL,
+        PRIMARY KEY (token, course_id)
+    ) WITHOUT ROWID
+''')
+# Deleting a course also drops it from every selection
+cursor.execute("CREATE INDEX IF NOT EXISTS idx_course_selections_course ON course_selections (course_id)")
+
+# Create the `solve_jobs` table for conflict resolution that runs in the background
+cursor.execute('''
+    CREATE TABLE IF NOT EXISTS solve_jobs (
+        id TEXT PRIMARY KEY,
+        status TEXT NOT NULL,             -- queued, running, done or failed
+        course_ids TEXT NOT NULL,         -- JSON list of the selected course ids
+        course_count INTEGER NOT NULL,
+        current_solver TEXT,
+        nodes_explored INTEGER NOT NULL DEFAULT 0,
+        courses_placed INTEGER NOT NULL DEFAULT 0,
+        result TEXT,                      -- JSON context for resolve_conflicts.html
+        error TEXT,
+        created_at REAL NOT NULL,
+        started_at REAL,
+        finished_at REAL
     )
 ''')
 
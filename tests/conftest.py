@@ -0,0 +1,48 @@
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope='session')
+def schema_path(tmp_path_factory):
+    """An empty database built by init_db.py, the same way a deployment creates one."""
+    path = str(tmp_path_factory.mktemp('schema') / 'schedule.db')
+    subprocess.run([sys.executable, os.path.join(ROOT, 'init_db.py'), path], check=True, cwd=ROOT,
+                   stdout=subprocess.DEVNULL)
+    return path
+
+
+@pytest.fixture
+def conn(schema_path):
+    conn = sqlite3.connect(schema_path)
+    conn.row_factory = sqlite3.Row
+    yield conn
+    conn.rollback()
+    conn.close()
+
+
+@pytest.fixture
+def db_path(schema_path, tmp_path):
+    """A fresh copy of the empty schema that the app uses for the test."""
+    import app
+
+    path = str(tmp_path / 'schedule.db')
+    shutil.copy(schema_path, path)
+    previous = app.app.config['DATABASE']
+    app.app.config['DATABASE'] = path
+    yield path
+    app.app.config['DATABASE'] = previous
+
+
+@pytest.fixture
+def client(db_path):
+    import app
+
+    return app.app.test_client()
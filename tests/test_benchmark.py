@@ -0,0 +1,23 @@
+import json
+import os
+import subprocess
+import sys
+
+import benchmark
+from conftest import ROOT
+
+
+def test_stdout_is_only_the_json_report(capsys):
+    benchmark.main(['--sizes', '20', '--repeats', '1', '--deadline', '0.2', '--solvers', 'greedy', 'backtracking'])
+    out, err = capsys.readouterr()
+    report = json.loads(out)
+    assert [result['solver'] for result in report['results']] == ['greedy', 'backtracking']
+    assert 'greedy' in err
+
+
+def test_importing_the_app_writes_nothing(tmp_path):
+    # Even against a database without the newer tables, importing app must not touch stdout
+    env = dict(os.environ, SCHEDULE_DATABASE=str(tmp_path / 'empty.db'))
+    completed = subprocess.run([sys.executable, '-c', 'import benchmark'], cwd=ROOT, env=env,
+                               capture_output=True, text=True, check=True)
+    assert completed.stdout == ''
@@ -0,0 +1,49 @@
+import sqlite3
+
+import app
+
+
+def add_courses(db_path, titles):
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.executemany("""
+            INSERT INTO course_schedule (teacher_name, course_code, course_title, day_of_week, class_start_time,
+                class_end_time, room, day_number, start_minute, end_minute)
+            VALUES (?, ?, ?, 'Monday', '09:00', '10:00', 1, 1, 540, 600)
+        """, [(f"Teacher {number}", f"CS{number:03d}", title) for number, title in enumerate(titles)])
+    conn.close()
+
+
+def walk_pages(client, url):
+    """Follow next_url from `url`; returns the course ids of every page and the last response."""
+    pages = []
+    while url:
+        data = client.get(url).get_json()
+        pages.append([course['id'] for course in data['courses']])
+        url = data['pagination']['next_url']
+    return pages, data
+
+
+def test_ranked_search_pages_through_every_match(client, db_path):
+    add_courses(db_path, [f"Algorithms {number}" for number in range(12)] + ["Databases"])
+    pages, data = walk_pages(client, '/api/v1/courses?q=Algorithms&per_page=5')
+    assert [len(page) for page in pages] == [5, 5, 2]
+    assert len({course_id for page in pages for course_id in page}) == data['pagination']['total'] == 12
+
+    previous = client.get(data['pagination']['previous_url']).get_json()
+    assert [course['id'] for course in previous['courses']] == pages[1]
+
+
+def test_ranked_search_offset_is_bounded(client, db_path, monkeypatch):
+    monkeypatch.setattr(app, 'MAX_SEARCH_OFFSET', 5)
+    add_courses(db_path, [f"Algorithms {number}" for number in range(12)])
+    pages, _ = walk_pages(client, '/api/v1/courses?q=Algorithms&per_page=5')
+    assert [len(page) for page in pages] == [5, 5]
+    data = client.get('/api/v1/courses?q=Algorithms&per_page=5&after=1000').get_json()
+    assert [course['id'] for course in data['courses']] == pages[1]
+
+
+def test_course_list_links_to_the_next_ranked_page(client, db_path):
+    add_courses(db_path, [f"Algorithms {number}" for number in range(7)])
+    page = client.get('/courses?q=Algorithms&per_page=5').get_data(as_text=True)
+    assert 'after=5' in page
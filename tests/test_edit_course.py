@@ -0,0 +1,32 @@
+import sqlite3
+
+import pytest
+
+FORM = {'teacher_name': 'Ada', 'course_code': 'CS101', 'course_title': 'Intro', 'day_of_week': 'Monday',
+        'class_start_time': '09:00', 'class_end_time': '10:00', 'room': '1'}
+
+
+@pytest.fixture
+def courses(db_path):
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.executemany("""
+            INSERT INTO course_schedule (id, teacher_name, course_code, course_title, day_of_week, class_start_time,
+                class_end_time, room, day_number, start_minute, end_minute)
+            VALUES (?, ?, ?, ?, 'Monday', ?, ?, ?, 1, ?, ?)
+        """, [(1, 'Ada', 'CS101', 'Intro', '09:00', '10:00', 1, 540, 600),
+              (2, 'Bob', 'CS102', 'Data', '11:00', '12:00', 2, 660, 720)])
+    yield conn
+    conn.close()
+
+
+def test_edit_keeping_its_own_slot_is_allowed(client, courses):
+    response = client.post('/edit/1', data=dict(FORM, course_title='Introduction'))
+    assert response.status_code == 302
+    assert courses.execute("SELECT course_title FROM course_schedule WHERE id = 1").fetchone()[0] == 'Introduction'
+
+
+def test_edit_into_another_booking_is_rejected(client, courses):
+    response = client.post('/edit/1', data=dict(FORM, class_start_time='11:30', class_end_time='12:30', room='2'))
+    assert b'Course conflicts with an existing course.' in response.data
+    assert courses.execute("SELECT start_minute, room FROM course_schedule WHERE id = 1").fetchone() == (540, 1)
@@ -0,0 +1,34 @@
+import io
+
+import app
+
+HEADER = 'teacher_name,course_code,course_title,day_of_week,class_start_time,class_end_time,room\n'
+
+
+def import_file(client, content, filename):
+    return client.post('/import', data={'course_file': (io.BytesIO(content.encode()), filename)},
+                       content_type='multipart/form-data')
+
+
+def report_lines(stream, filename):
+    conn = app.get_db_connection()
+    try:
+        _, report = app.import_courses(conn, app.read_import_rows(stream, filename))
+    finally:
+        conn.close()
+    return [entry['line'] for entry in report]
+
+
+def test_csv_report_uses_file_line_numbers(db_path):
+    content = HEADER + 'Ada,CS101,Intro,Monday,09:00,10:00,1\nAda,CS102,Clash,Monday,09:30,10:30,2\nBob,,Bad,Monday,09:00,10:00,3\n'
+    assert report_lines(io.BytesIO(content.encode()), 'courses.csv') == [3, 4]
+
+
+def test_jsonl_report_counts_blank_lines(db_path):
+    content = '{"teacher_name": "Ada"}\n\n{"teacher_name": "Bob"}\n'
+    assert report_lines(io.BytesIO(content.encode()), 'courses.jsonl') == [1, 3]
+
+
+def test_upload_report_shows_csv_line(client):
+    response = import_file(client, HEADER + 'Ada,CS101,Intro,Monday,10:00,09:00,1\n', 'courses.csv')
+    assert b'<td>2</td>' in response.data
@@ -0,0 +1,28 @@
+import sqlite3
+import subprocess
+import sys
+
+from conftest import ROOT
+
+
+def run_init_db(path):
+    subprocess.run([sys.executable, 'init_db.py', path], check=True, cwd=ROOT, stdout=subprocess.DEVNULL)
+
+
+def test_rerun_replaces_stale_conflicts(db_path):
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.executemany("""
+            INSERT INTO course_schedule (id, teacher_name, course_code, course_title, day_of_week, class_start_time,
+                class_end_time, room, day_number, start_minute, end_minute)
+            VALUES (?, ?, ?, 'Course', 'Monday', ?, ?, 1, 1, ?, ?)
+        """, [(1, 'Ada', 'CS101', '09:00', '10:00', 540, 600),
+              (2, 'Bob', 'CS102', '09:30', '10:30', 570, 630),
+              (3, 'Cy', 'CS103', '11:00', '12:00', 660, 720)])
+        conn.execute("INSERT INTO course_conflicts (course_id, other_id, kind) VALUES (1, 3, 'room')")
+    conn.close()
+
+    run_init_db(db_path)
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT course_id, other_id, kind FROM course_conflicts").fetchall() == [(1, 2, 'room')]
+    conn.close()
@@ -0,0 +1,49 @@
+import app
+
+
+def traced_statements(conn, action):
+    """Run `action(conn)` and return the statements it executed, with parameters bound."""
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        action(conn)
+    finally:
+        conn.set_trace_callback(None)
+    return [sql for sql in statements if 'course_schedule' in sql]
+
+
+def full_scans(conn, sql):
+    """Plan steps that read course_schedule (or an alias of it) from start to end."""
+    aliases = ('course_schedule', 'c', 'o')
+    plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    return [row['detail'] for row in plan
+            if row['detail'].startswith('SCAN ') and row['detail'].split()[1] in aliases]
+
+
+def assert_no_full_scans(conn, action, expected):
+    statements = traced_statements(conn, action)
+    assert len(statements) == expected
+    for sql in statements:
+        assert full_scans(conn, sql) == [], sql
+
+
+def test_conflict_check_seeks_both_slot_indexes(conn):
+    sql = traced_statements(conn, lambda conn: app.check_schedule_conflict(conn, 'Ada', 1, 540, 600, 101))[0]
+    plan = [row['detail'] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+    assert any('idx_course_room_slot' in detail for detail in plan)
+    assert any('idx_course_teacher_slot' in detail for detail in plan)
+    assert full_scans(conn, sql) == []
+
+
+def test_conflict_check_excluding_a_course_avoids_scan(conn):
+    assert_no_full_scans(conn, lambda conn: app.check_schedule_conflict(conn, 'Ada', 1, 540, 600, 101, exclude_id=7), 1)
+
+
+def test_record_course_conflicts_avoids_scan(conn):
+    # The room and teacher INSERT ... SELECT self-joins
+    assert_no_full_scans(conn, lambda conn: app.record_course_conflicts(conn, 7), 2)
+
+
+def test_refresh_busy_slots_avoids_scan(conn):
+    # One mask query per (day, room) and per (day, teacher) key
+    assert_no_full_scans(conn, lambda conn: app.refresh_busy_slots(conn, [(1, 101, 'Ada')]), 2)
@@ -0,0 +1,56 @@
+import sqlite3
+
+import pytest
+
+
+@pytest.fixture
+def courses(db_path):
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.executemany("""
+            INSERT INTO course_schedule (id, teacher_name, course_code, course_title, day_of_week, class_start_time,
+                class_end_time, room, day_number, start_minute, end_minute)
+            VALUES (?, ?, ?, ?, 'Monday', ?, ?, ?, 1, ?, ?)
+        """, [(1, 'Ada', 'CS101', 'Intro', '09:00', '10:00', 1, 540, 600),
+              (2, 'Bob', 'CS102', 'Data', '11:00', '12:00', 2, 660, 720)])
+    yield conn
+    conn.close()
+
+
+def flashed(client):
+    with client.session_transaction() as session:
+        return [message for _, message in session.pop('_flashes', [])]
+
+
+def test_deleted_course_leaves_the_selection(client, courses):
+    client.post('/select_courses', data={'courses': ['1', '2']})
+    client.get('/delete/1')
+    flashed(client)
+    assert courses.execute("SELECT course_id FROM course_selections").fetchall() == [(2,)]
+    client.post('/select_courses', data={'courses': ['2']})
+    assert flashed(client) == ['1 course(s) selected!']
+
+
+def test_selection_skips_ids_that_are_not_courses(client, courses):
+    response = client.post('/select_courses', data={'courses': ['abc', '1', '99']})
+    assert response.status_code == 302
+    assert flashed(client) == ['1 course(s) selected!']
+
+
+def test_selection_api_is_not_shared_between_sessions(client, courses):
+    client.post('/select_courses', data={'courses': ['1']})
+    response = client.get('/api/v1/selection/conflicts')
+    assert response.headers['Cache-Control'] == 'private, no-cache'
+    assert 'Cookie' in response.vary
+    revalidated = client.get('/api/v1/selection/conflicts', headers={'If-None-Match': response.headers['ETag']})
+    assert revalidated.status_code == 304
+    assert revalidated.headers['Cache-Control'] == 'private, no-cache'
+
+
+def test_pager_saves_the_page_before_moving(client, courses):
+    page = client.get('/select_courses?per_page=1').get_data(as_text=True)
+    assert 'formaction="/select_courses?per_page=1&amp;after=' in page
+    next_url = page.split('formaction="', 1)[1].split('"', 1)[0].replace('&amp;', '&')
+    response = client.post(next_url, data={'courses': ['1'], 'page_courses': ['1'], 'turn_page': '1'})
+    assert response.status_code == 302 and response.location == next_url
+    assert courses.execute("SELECT course_id FROM course_selections").fetchall() == [(1,)]
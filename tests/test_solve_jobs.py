@@ -0,0 +1,38 @@
+import sqlite3
+import time
+
+import app
+
+
+def add_job(db_path, job_id, status, age):
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("""
+            INSERT INTO solve_jobs (id, status, course_ids, course_count, created_at, started_at)
+            VALUES (?, ?, '[]', 0, ?, ?)
+        """, (job_id, status, time.time() - age, time.time() - age if status == 'running' else None))
+    conn.close()
+
+
+def job_status(client, job_id):
+    return client.get(f'/solve_jobs/{job_id}/status').get_json()
+
+
+def test_job_running_past_every_deadline_is_failed(client, db_path):
+    lost = app.app.config['SOLVE_JOB_DEADLINE'] * len(app.SOLVERS) + app.SOLVE_JOB_STALE_GRACE + 1
+    add_job(db_path, 'lost', 'running', lost)
+    add_job(db_path, 'busy', 'running', 1)
+    status = job_status(client, 'lost')
+    assert status['status'] == 'failed'
+    assert 'crashed or restarted' in status['error']
+    assert job_status(client, 'busy')['status'] == 'running'
+
+
+def test_job_never_picked_up_is_failed_and_not_started_later(client, db_path):
+    add_job(db_path, 'forgotten', 'queued', app.app.config['SOLVE_JOB_QUEUE_TIMEOUT'] + 1)
+    add_job(db_path, 'waiting', 'queued', 1)
+    assert job_status(client, 'forgotten')['status'] == 'failed'
+    assert job_status(client, 'waiting')['status'] == 'queued'
+
+    app.run_solve_job('forgotten', db_path, 1.0)
+    assert job_status(client, 'forgotten')['status'] == 'failed'
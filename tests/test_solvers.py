@@ -0,0 +1,130 @@
+import time
+from concurrent.futures import Future
+
+import pytest
+
+import app
+import benchmark
+from app import Course, RoomCatalogue, SOLVERS, format_time
+
+
+def make_course(course_id, teacher_name, room, day_number=1, start_minute=540, end_minute=600, enrollment=0):
+    return Course(
+        id=course_id, teacher_name=teacher_name, course_title=f"Course {course_id}",
+        day_of_week=app.DAY_NAMES[day_number - 1], class_start_time=format_time(start_minute),
+        class_end_time=format_time(end_minute), room=room, enrollment=enrollment, required_features='',
+        day_number=day_number, start_minute=start_minute, end_minute=end_minute,
+    )
+
+
+def placed_count(result):
+    return len(result['resolved_courses'])
+
+
+@pytest.fixture
+def large_catalogue():
+    return RoomCatalogue((room, f"Room {room}", 40, frozenset()) for room in range(1, 41))
+
+
+@pytest.mark.parametrize('name', sorted(SOLVERS))
+def test_solvers_use_rooms_beyond_the_first_candidates(name, large_catalogue):
+    # Thirty clashing courses and forty free rooms: every course fits without moving in time
+    courses = tuple(make_course(course_id, f"Teacher {course_id}", 1) for course_id in range(1, 31))
+    result = SOLVERS[name](courses, deadline=time.time() + 5, catalogue=large_catalogue)
+    assert placed_count(result) == len(courses)
+    assert len({course['room'] for course in result['resolved_courses']}) >= len(courses) - app.MAX_CANDIDATE_ROOMS
+
+
+def test_candidate_windows_spread_over_the_catalogue(large_catalogue):
+    courses = [make_course(course_id, 'Ada', 1) for course_id in range(1, 11)]
+    columns = app.CourseColumns(courses, large_catalogue)
+    candidates = [[columns.rooms[room] for room in columns.candidates(i)] for i in range(len(courses))]
+    assert all(rooms[0] == 1 and len(rooms) <= app.MAX_CANDIDATE_ROOMS + 1 for rooms in candidates)
+    assert len(set().union(*candidates)) == 40
+
+
+def test_room_catalogue_reloads_when_rooms_change(conn):
+    before = app.get_room_catalogue(conn)
+    assert app.get_room_catalogue(conn) is before
+    conn.execute("INSERT INTO rooms (id, name, capacity) VALUES (900, 'Hall 900', 300)")
+    after = app.get_room_catalogue(conn)
+    assert after is not before
+    assert after.names[900] == 'Hall 900'
+
+
+@pytest.mark.parametrize('size', [500, 1000])
+def test_timed_out_search_places_at_least_as_many_as_greedy(size):
+    courses, rooms = benchmark.generate_schedule(size, 20, 60, 1.2, seed=3)
+    catalogue = RoomCatalogue(rooms)
+    greedy = SOLVERS['greedy'](courses, catalogue=catalogue)
+    search = SOLVERS['backtracking'](courses, deadline=time.time() + 0.2, catalogue=catalogue)
+    assert search['timed_out']
+    assert placed_count(search) >= placed_count(greedy)
+    assert placed_count(search) + len(search['unresolved_courses']) == size
+
+
+@pytest.mark.parametrize('name', ['backtracking', 'optimized'])
+def test_solver_setup_respects_the_deadline(name):
+    courses, rooms = benchmark.generate_schedule(8000, 20, 60, 1.2, seed=1)
+    catalogue = RoomCatalogue(rooms)
+    greedy = SOLVERS['greedy'](courses, catalogue=catalogue)
+    started = time.perf_counter()
+    result = SOLVERS[name](courses, deadline=time.time() + 0.1, catalogue=catalogue)
+    assert time.perf_counter() - started < 1.0
+    assert result['timed_out'] or result['objective']['stopped'] == 'deadline'
+    assert placed_count(result) >= placed_count(greedy)
+
+
+def test_stopped_optimizer_places_at_least_as_many_as_greedy():
+    courses, rooms = benchmark.generate_schedule(1000, 20, 60, 1.2, seed=2)
+    catalogue = RoomCatalogue(rooms)
+    greedy = SOLVERS['greedy'](courses, catalogue=catalogue)
+    optimized = SOLVERS['optimized'](courses, deadline=time.time() + 0.05, catalogue=catalogue)
+    assert optimized['objective']['stopped'] == 'deadline'
+    assert placed_count(optimized) >= placed_count(greedy)
+
+
+def test_optimizer_moves_consider_every_cheaper_option():
+    catalogue = RoomCatalogue((room, f"Room {room}", 40, frozenset()) for room in (1, 2, 3))
+    courses = (make_course(1, 'Ada', 1), make_course(2, 'Bob', 1), make_course(3, 'Cy', 2), make_course(4, 'Dee', 3))
+    optimizer = app.ScheduleOptimizer(courses, catalogue, deadline=time.time() + 1)
+    unplaced = 1
+    optimizer._remove(unplaced)
+    optimizer._displaced_list = (unplaced,)
+    ranges = []
+    draw = optimizer.rng.randrange
+    optimizer.rng.randrange = lambda stop: ranges.append(stop) or draw(stop)
+    optimizer._step(0)
+    # Every option beats being unplaced, shifted ones included
+    assert ranges == [len(optimizer.options[unplaced])]
+    assert ranges[0] > app.MAX_CANDIDATE_ROOMS
+
+
+class StalledExecutor:
+    """Runs greedy tasks at once; every other task never reports back."""
+
+    def submit(self, fn, name, *args):
+        future = Future()
+        if name == 'greedy':
+            future.set_result(fn(name, *args))
+        return future
+
+
+def test_lost_partitions_are_reported_unprocessed(monkeypatch):
+    courses, rooms = benchmark.generate_schedule(200, 20, 60, 1.2, seed=1)
+    monkeypatch.setattr(app, 'get_solver_executor', StalledExecutor)
+    results = app.run_solvers(courses, RoomCatalogue(rooms), deadline_seconds=0.01)
+    for name, (result, _) in results.items():
+        assert placed_count(result) + len(result['unresolved_courses']) == len(courses), name
+    backtracking = results['backtracking'][0]
+    assert backtracking['timed_out']
+    assert all(entry['conflict_info']['conflict_reason'].startswith(app.UNPROCESSED_REASON)
+               for entry in backtracking['unresolved_courses'])
+    assert results['optimized'][0]['objective']['unplaced'] == len(courses)
+
+
+def test_deadline_capped_optimizer_runs_are_left_out_of_the_growth_fit():
+    courses, rooms = benchmark.generate_schedule(400, 20, 60, 1.2, seed=1)
+    measurement = app.measure_solver('optimized', courses, RoomCatalogue(rooms), repeats=1, warmup=0, run_deadline=0.001)
+    assert all(point['timed_out_runs'] == 1 for point in measurement['points'])
+    assert measurement['time_exponent'] is None